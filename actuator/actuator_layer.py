@@ -1,10 +1,14 @@
+import math
 import numpy as np
+from operator import itemgetter
 from lerobot.teleoperators.so101_leader import SO101LeaderConfig, SO101Leader
 from lerobot.robots.so101_follower import SO101FollowerConfig, SO101Follower
 from enum import Enum
 import click
 import argparse
+import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 
 # Add the parent directory to the Python path
@@ -14,9 +18,17 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from actuator.utils.detect_serial import detect_so101_ports
 from actuator.visualizer import Visualizer
-from actuator.kinematics.dh_table import *
-from actuator.kinematics.arm_kinematics import *
-from actuator.kinematics.constants import *
+from actuator.kinematics.dh_table import dh_to_mech_angles, mech_to_dh_angles
+from actuator.kinematics.arm_kinematics import (
+    compute_end_effector_pos_from_joints,
+    compute_inverse_kinematics_at_desired_wrist_position,
+    get_euclidian_distance,
+    get_instantenous_controller_target,
+    is_close_to_target,
+)
+from actuator.kinematics.constants import JOINT_NAMES_AS_INDEX, L5
+
+_log = logging.getLogger("actuator")
 
 class Mode(Enum):
     FULL_TELEOP = "FULL_TELEOP"
@@ -65,44 +77,98 @@ class ActuatorLayer:
                 self.teleop_device = SO101Leader(teleop_config)
                 self.teleop_device.connect()
 
+        # lets the follower observation overlap the leader read; each device
+        # is only ever touched from one thread at a time
+        if not virtual and mode != Mode.AUTONOMOUS:
+            self._io_pool = ThreadPoolExecutor(max_workers=1)
+
         self.use_visualizer = use_visualizer
         if use_visualizer:
             self.visualizer = Visualizer()
             self.visualizer_count = 0
+            # matplotlib redraws cost tens of ms; only plot every Nth tick so
+            # the control loop isn't paced by rendering
+            self.visualizer_decimation = 10
 
-        self.request = ActuatorLayerRequest(0.17, 0.0, 0.05, np.deg2rad(90.0), 0.1)
+        self.request = ActuatorLayerRequest(0.17, 0.0, 0.05, math.radians(90.0), 0.1)
         self.request_fresh = True
 
         self.speed_limit_m_per_s = 0.4  # m/s
 
         # misc
+        self._fk_cache = {}
+        self._N = len(JOINT_NAMES_AS_INDEX)
+        self._pos_keys = tuple(f"{joint}.pos" for joint in JOINT_NAMES_AS_INDEX)
+        self._pos_getter = itemgetter(*self._pos_keys)
+        self._joint_cmd_buf = np.zeros(self._N, dtype=np.float32)
+
+        # one contiguous block for all per-tick joint state, indexed
+        # [src, space, joint] with src 0=robot 1=teleop, space 0=mech 1=dh;
+        # the public attributes below are persistent views into it
+        self._joints = np.zeros((2, 2, self._N), dtype=np.float32)
+        self.mech_joint_angles_actual_rad = self._joints[0, 0]
+        self.dh_joint_angles_actual_rad = self._joints[0, 1]
+        self.teleop_mech_joint_angles_actual_rad = self._joints[1, 0]
+        self.teleop_dh_joint_angles_actual_rad = self._joints[1, 1]
         self.gripper_cmd_scale_y = [0.1027924, 1.7260]
+        # gripper command maps [0, 1] onto gripper_cmd_scale_y; precompute the
+        # affine form so the loop does a scalar multiply-add, not np.interp
+        self._grip_scale = self.gripper_cmd_scale_y[1] - self.gripper_cmd_scale_y[0]
+        self._grip_offset = self.gripper_cmd_scale_y[0]
         self.time_prev = time.time()
         self.close_to_target = False
 
     def is_close_to_target(self):
         return self.close_to_target
 
+    def _end_effector_pos_cached(self, dh_angles, source):
+        # at rest (or between servo updates) the reported joint angles repeat
+        # across ticks, so reuse the last FK result per source when unchanged
+        dh_angles = np.asarray(dh_angles)
+        cached = self._fk_cache.get(source)
+        if cached is not None and np.array_equal(cached[0], dh_angles):
+            return cached[1]
+        pos = compute_end_effector_pos_from_joints(dh_angles)
+        self._fk_cache[source] = (dh_angles.copy(), pos)
+        return pos
+
+    def _joint_dict_to_array(self, joint_positions):
+        """Pull the per-joint dict from the robot layer into a flat ndarray."""
+        return np.asarray(self._pos_getter(joint_positions), dtype=np.float32)
+
+    def _joint_array_to_dict(self, joint_array):
+        """Expand a flat joint ndarray back into the robot layer's dict form."""
+        return dict(zip(self._pos_keys, joint_array.tolist()))
+
     def update_robot_state(self):
+        teleop_joint_positions = None
         if self.dry_run:
             if not hasattr(self, 'action'):
-                self.action = {f"{joint}.pos": 0.0 for joint in JOINT_NAMES_AS_INDEX}
+                self.action = {key: 0.0 for key in self._pos_keys}
             joint_positions = self.action
+        elif self.mode != Mode.AUTONOMOUS:
+            # the follower and leader reads are independent serial round-trips;
+            # overlap them so the tick costs max() of the two instead of the sum
+            observation_future = self._io_pool.submit(self.robot.get_observation)
+            teleop_joint_positions = self.teleop_device.get_action()
+            joint_positions = observation_future.result()
         else:
             joint_positions = self.robot.get_observation()
-        joint_angles = [joint_positions[f"{joint}.pos"] for joint in JOINT_NAMES_AS_INDEX]
-        self.mech_joint_angles_actual_rad = [np.deg2rad(angle) for angle in joint_angles]
-        self.dh_joint_angles_actual_rad = mech_to_dh_angles(self.mech_joint_angles_actual_rad)
-        # print(f"DH Joint Angles (rad): {self.dh_joint_angles_actual_rad}")
-        self.end_effector_pos = compute_end_effector_pos_from_joints(np.array(self.dh_joint_angles_actual_rad))
-        # print(f"End Effector Position: x={self.end_effector_pos[0]:.3f}, y={self.end_effector_pos[1]:.3f}, z={self.end_effector_pos[2]:.3f}")
+        np.deg2rad(self._joint_dict_to_array(joint_positions), out=self.mech_joint_angles_actual_rad)
+        self.dh_joint_angles_actual_rad[:] = mech_to_dh_angles(self.mech_joint_angles_actual_rad)
+        self.end_effector_pos = self._end_effector_pos_cached(self.dh_joint_angles_actual_rad, "robot")
+        # per-tick diagnostics: syscalls into stdout stall a >100 Hz loop, so
+        # only format/emit when debug logging is actually enabled
+        if _log.isEnabledFor(logging.DEBUG):
+            _log.debug("DH joint angles (rad): %s", self.dh_joint_angles_actual_rad)
+            _log.debug("End effector position: %s", self.end_effector_pos)
 
         if self.mode != Mode.AUTONOMOUS:
-            teleop_joint_positions = self.teleop_device.get_action()
-            teleop_joint_angles = [teleop_joint_positions[f"{joint}.pos"] for joint in JOINT_NAMES_AS_INDEX]
-            self.teleop_mech_joint_angles_actual_rad = [np.deg2rad(angle) for angle in teleop_joint_angles]
-            self.teleop_dh_joint_angles_actual_rad = mech_to_dh_angles(self.teleop_mech_joint_angles_actual_rad)
-            self.teleop_end_effector_pos = compute_end_effector_pos_from_joints(np.array(self.teleop_dh_joint_angles_actual_rad))
+            if teleop_joint_positions is None:
+                teleop_joint_positions = self.teleop_device.get_action()
+            np.deg2rad(self._joint_dict_to_array(teleop_joint_positions), out=self.teleop_mech_joint_angles_actual_rad)
+            self.teleop_dh_joint_angles_actual_rad[:] = mech_to_dh_angles(self.teleop_mech_joint_angles_actual_rad)
+            self.teleop_end_effector_pos = self._end_effector_pos_cached(self.teleop_dh_joint_angles_actual_rad, "teleop")
 
         self.dt_measured = time.time() - self.time_prev
         self.time_prev = time.time()
@@ -146,14 +212,13 @@ class ActuatorLayer:
         )
 
         # if any ik solution is NaN, ignore the command
-        if np.isnan(ik_solution).any():
+        if any(map(math.isnan, ik_solution)):
             click.secho(f"Warning: IK solution resulted in NaN for target position of {self.teleop_end_effector_pos}, ignoring command", fg="yellow")
             return self.dh_joint_angles_actual_rad
 
         # send only the elbow joint command to the follower arm
-        joint_cmd_dh = np.zeros(len(JOINT_NAMES_AS_INDEX))
-        for i in range(len(ik_solution)):
-            joint_cmd_dh[i] = ik_solution[i]
+        joint_cmd_dh = self._joint_cmd_buf
+        joint_cmd_dh[:len(ik_solution)] = ik_solution
 
         joint_cmd_dh[4] = self.teleop_dh_joint_angles_actual_rad[4]
         joint_cmd_dh[5] = self.teleop_dh_joint_angles_actual_rad[5]  # gripper
@@ -176,11 +241,7 @@ class ActuatorLayer:
         y = target_end_effector_location[1]
         z = target_end_effector_location[2]
         wrist_angle = self.request.wrist_angle_rad
-        gripper_cmd = np.interp(
-            self.request.gripper_cmd,
-            [0.0, 1.0],
-            self.gripper_cmd_scale_y
-        )
+        gripper_cmd = self._grip_scale * min(max(self.request.gripper_cmd, 0.0), 1.0) + self._grip_offset
         self.request_fresh = False
 
         if not self.is_commanded_location_safe(*request_pos):
@@ -192,14 +253,13 @@ class ActuatorLayer:
             x, y, z, wrist_approach_angle
         )
 
-        if np.isnan(ik_solution).any():
+        if any(map(math.isnan, ik_solution)):
             click.secho(f"Warning: IK solution resulted in NaN for target position of {x}, {y}, {z}, ignoring command", fg="yellow")
             return self.dh_joint_angles_actual_rad
     
-        joint_cmd_dh = np.zeros(len(JOINT_NAMES_AS_INDEX))
-        for i in range(len(ik_solution)):
-            joint_cmd_dh[i] = ik_solution[i]
-        
+        joint_cmd_dh = self._joint_cmd_buf
+        joint_cmd_dh[:len(ik_solution)] = ik_solution
+
         joint_cmd_dh[4] = wrist_angle
         joint_cmd_dh[5] = gripper_cmd  # gripper
 
@@ -232,8 +292,9 @@ class ActuatorLayer:
             raise NotImplementedError("Only FULL_TELEOP mode is implemented.")
         
         joint_angle_cmd_mech = dh_to_mech_angles(joint_angle_cmd)
-        assert len(joint_angle_cmd_mech) == JOINT_NAMES_AS_INDEX.__len__(), "Joint command length mismatch."
-        self.action = {f"{JOINT_NAMES_AS_INDEX[i]}.pos": np.rad2deg(joint_angle_cmd_mech[i]) for i in range(len(joint_angle_cmd_mech))}
+        assert len(joint_angle_cmd_mech) == self._N, "Joint command length mismatch."
+        joint_angle_cmd_deg = np.rad2deg(np.asarray(joint_angle_cmd_mech))
+        self.action = self._joint_array_to_dict(joint_angle_cmd_deg)
 
         if self.dry_run:
             pass
@@ -244,9 +305,9 @@ class ActuatorLayer:
         
         if self.use_visualizer:
             self.visualizer_count += 1
-            if self.visualizer_count % 1 == 0:
+            if self.visualizer_count >= self.visualizer_decimation:
                 self.visualizer.plot(self.dh_joint_angles_actual_rad)
-                self.visualizer_count = 0 
+                self.visualizer_count = 0
 
     
 if __name__ == "__main__":
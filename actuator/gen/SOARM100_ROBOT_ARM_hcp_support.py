@@ -1,10 +1,27 @@
 """SOARM100_ROBOT_ARM_hcp_support.py — Auto-generated HCP SDK TCP Client"""
-import json
+import collections
+import selectors
 import socket
 import threading
 import time
 import queue
 
+# serializer shim: prefer orjson, then ujson, then stdlib json —
+# the client transparently uses the fastest library installed
+try:
+    import orjson as _json
+    _loads = _json.loads
+    _dumps = _json.dumps  # returns bytes
+except ImportError:
+    try:
+        import ujson as _json
+        _dumps = lambda o: _json.dumps(o).encode('utf-8')  # compact by default
+    except ImportError:
+        import json as _json
+        # compact separators: no whitespace bytes on the wire
+        _dumps = lambda o: _json.dumps(o, separators=(',', ':')).encode('utf-8')
+    _loads = _json.loads
+
 DEVICE_ID = 'SOARM100_ROBOT_ARM'
 DEVICE_DESC = """A robot arm capable of moving in 3D space and controlling a gripper.  The arm can move to specified (x, y, z) coordinates in mm, open and close its gripper, and set the wrist angle of the gripper. The robot starts at (170, 0, 150). The coordinate frame is aligned such that +X is forward, +Z is up, +Y is to the left when facing forward. The gripper is closed on init, with the wrist angle at 90 degrees."""
 HCP_HOST = "10.235.118.92"
@@ -51,6 +68,14 @@ HCP_DEVICE_JSON = { 'available_commands': { 'control_grip': { 'freetext_desc': '
                                  'gripper is closed on init, with the wrist '
                                  'angle at 90 degrees.'}}
 
+# serialized and framed at SDK-generation time; every
+# REQUEST_HCP_DATA reply sends this frame as-is
+_HCP_DEVICE_FRAME = b'\x00\x00\x03\xdf{"metadata":{"device_id":"SOARM100_ROBOT_ARM","freetext_desc":"A robot arm capable of moving in 3D space and controlling a gripper.  The arm can move to specified (x, y, z) coordinates in mm, open and close its gripper, and set the wrist angle of the gripper. The robot starts at (170, 0, 150). The coordinate frame is aligned such that +X is forward, +Z is up, +Y is to the left when facing forward. The gripper is closed on init, with the wrist angle at 90 degrees."},"available_commands":{"move_arm":{"freetext_desc":"Moves the arm to the specified 3D coordinates, each given in mm. Max range is - x: [0, 250], y: [-250, 250], z: [-100, 170] mm.","params":[{"x":"int"},{"y":"int"},{"z":"int"}]},"control_grip":{"freetext_desc":"Opens or closes the gripper.","params":[{"closed":"bool"}]},"set_wrist_angle":{"freetext_desc":"Sets the wrist angle of the gripper in degrees. 90deg is flat, with positive angles rotating counter-clockwise. 0 0 is vertical up.","params":[{"angle":"float"}]}}}'
+
+# scatter-gather writes (writev) where the platform has them;
+# Windows lacks sendmsg, so fall back to plain send
+_HAS_SENDMSG = hasattr(socket.socket, 'sendmsg')
+
 class HCPClient:
     def __init__(self):
         self.host = HCP_HOST
@@ -58,7 +83,9 @@ class HCPClient:
         self.sock = None
         self.running = False
         self.events = queue.Queue()  # incoming (action, payload)
-        self._responses = queue.Queue()  # outgoing responses
+        self._send_q = queue.Queue()  # outgoing frames as buffer tuples
+        self._rx_buf = bytearray()  # partial inbound bytes awaiting a full frame
+        self._recv_buf = bytearray(65536)  # reusable recv_into scratch buffer
 
     def start(self):
         if not self.running:
@@ -68,13 +95,23 @@ class HCPClient:
 
     def send_response(self, action, body):
         '''Thread-safe: enqueue a response to send back to HCP'''
-        self._responses.put({'action': action, 'body': body})
+        self._send_json({'action': action, 'body': body})
 
     def _connect_loop(self):
         while self.running:
             try:
                 self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
                 self.sock.connect((self.host, self.port))
+                # frames are tiny and latency-sensitive: don't let
+                # Nagle coalesce them; keepalive surfaces a dead HCP
+                # host without application-level pings
+                try:
+                    self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                    self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+                    if hasattr(socket, 'TCP_KEEPIDLE'):  # Linux only
+                        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30)
+                except OSError:
+                    pass
                 print(f'[OK] Connected to HCP host {self.host}:{self.port}')
                 self._listen_loop()
             except (ConnectionRefusedError, OSError):
@@ -82,34 +119,112 @@ class HCPClient:
                 time.sleep(3)
 
     def _listen_loop(self):
-        while self.running:
-            try:
-                data = self.sock.recv(4096).decode('utf-8')
-                if not data:
-                    print('[INFO] Disconnected, reconnecting...')
-                    return
-                message = json.loads(data)
-                action = message.get('action')
-                payload = message.get('payload', {})
-
-                if action == 'REQUEST_HCP_DATA':
-                    self._send_json(HCP_DEVICE_JSON)
-                else:
-                    # push incoming actions to main thread queue
-                    self.events.put((action, payload))
-                    # send response queued by main thread
-                    resp = self._responses.get()
-                    self._send_json(resp)
-
-            except Exception as e:
-                print('[ERROR]', e)
-                time.sleep(1)
+        # Non-blocking socket driven by a selector: reads never wait on
+        # the send side, and responses queued by the main thread are
+        # flushed whenever the socket is writable.
+        self.sock.setblocking(False)
+        self._rx_buf = bytearray()
+        sel = selectors.DefaultSelector()
+        # read-only interest while idle: a connected socket is almost
+        # always writable, so permanent EVENT_WRITE would make select
+        # return instantly and spin the loop at 100% CPU. Write
+        # interest is added only while frames are queued and dropped
+        # once the backlog drains.
+        sel.register(self.sock, selectors.EVENT_READ)
+        tx_bufs = collections.deque()
+        want_write = False
+        try:
+            while self.running:
+                while True:
+                    try:
+                        tx_bufs.extend(self._send_q.get_nowait())
+                    except queue.Empty:
+                        break
+                if bool(tx_bufs) != want_write:
+                    want_write = bool(tx_bufs)
+                    sel.modify(self.sock, selectors.EVENT_READ | selectors.EVENT_WRITE
+                               if want_write else selectors.EVENT_READ)
+                for key, mask in sel.select(timeout=0.05):
+                    if mask & selectors.EVENT_READ:
+                        try:
+                            # read into the reusable buffer: no bytes
+                            # allocation per recv on the hot path
+                            n = self.sock.recv_into(self._recv_buf)
+                        except (BlockingIOError, InterruptedError):
+                            continue
+                        except OSError:
+                            print('[INFO] Disconnected, reconnecting...')
+                            return
+                        if n == 0:
+                            print('[INFO] Disconnected, reconnecting...')
+                            return
+                        try:
+                            self._handle_data(memoryview(self._recv_buf)[:n])
+                        except Exception as e:
+                            # a corrupt frame or malformed message must
+                            # not kill the listener thread; treat it as
+                            # a connection reset and resync via reconnect
+                            print(f'[WARN] Bad frame ({e}); reconnecting...')
+                            return
+                    if tx_bufs and (mask & selectors.EVENT_WRITE):
+                        try:
+                            if _HAS_SENDMSG:
+                                # one writev flushes header and payload
+                                # (and several queued frames) together
+                                bufs = [tx_bufs[i] for i in range(min(len(tx_bufs), 16))]
+                                sent = self.sock.sendmsg(bufs)
+                            else:
+                                sent = self.sock.send(tx_bufs[0])
+                            while sent:
+                                head = tx_bufs[0]
+                                if sent >= len(head):
+                                    sent -= len(head)
+                                    tx_bufs.popleft()
+                                else:
+                                    tx_bufs[0] = head[sent:]
+                                    sent = 0
+                        except (BlockingIOError, InterruptedError):
+                            pass
+                        except OSError:
+                            print('[INFO] Disconnected, reconnecting...')
+                            return
+        finally:
+            sel.unregister(self.sock)
+            sel.close()
+
+    def _handle_data(self, data):
+        # Frames carry a 4-byte big-endian length prefix: accumulate
+        # bytes and pop complete frames off the front; a partial tail
+        # just waits for the next read. No speculative JSON parsing.
+        self._rx_buf += data
+        while True:
+            if len(self._rx_buf) < 4:
+                return
+            n = int.from_bytes(self._rx_buf[:4], 'big')
+            if len(self._rx_buf) < 4 + n:
+                return
+            payload = bytes(self._rx_buf[4:4 + n])
+            del self._rx_buf[:4 + n]
+            self._dispatch(_loads(payload))
+
+    def _dispatch(self, message):
+        action = message.get('action')
+        payload = message.get('payload', {})
+
+        if action == 'REQUEST_HCP_DATA':
+            self._send_q.put((_HCP_DEVICE_FRAME,))
+        else:
+            # push incoming actions to main thread queue; the main
+            # thread replies via send_response when it is ready
+            self.events.put((action, payload))
 
     def _send_json(self, obj):
-        try:
-            self.sock.sendall(json.dumps(obj).encode('utf-8'))
-        except Exception as e:
-            print('[ERROR] Failed to send JSON:', e)
+        # _dumps yields bytes; the 4-byte length prefix frames the
+        # stream for the receiver. Header and payload are queued as
+        # separate buffers — sendmsg stitches them on the wire, so
+        # there is no header+payload concatenation per message
+        data = _dumps(obj)
+        self._send_q.put((len(data).to_bytes(4, 'big'), data))
 
     def stop(self):
         self.running = False
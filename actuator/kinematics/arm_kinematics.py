@@ -1,15 +1,111 @@
-# include parent dir
-import sys
-import os
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
 import math
+from functools import lru_cache
+
 import numpy as np
-from actuator.kinematics.dh_table import *
+from actuator.kinematics.dh_table import DH_CONST, ROBOT_DH_TABLES, dh_transform_matrix_fast
+from actuator.kinematics.constants import L1, L2, L3, L4, L5, PI_2
+from actuator.kinematics import fk_njit
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to plain Python
+    def njit(*args, **kwargs):
+        def wrap(func):
+            return func
+        return wrap
 
 def get_euclidian_distance(x, y):
-    return (x**2 + y**2)**0.5
-
+    return math.hypot(x, y)
+
+# DH table columns unpacked once at import; FK slices views of these
+# instead of re-slicing ROBOT_DH_TABLES per call. float32 is plenty for
+# the SO-101's ~0.1 deg servo resolution and halves memory traffic.
+_THETA0 = np.asarray([row[0] for row in ROBOT_DH_TABLES], dtype=np.float32)
+_D = np.asarray([row[1] for row in ROBOT_DH_TABLES], dtype=np.float32)
+_A = np.asarray([row[2] for row in ROBOT_DH_TABLES], dtype=np.float32)
+_ALPHA = np.asarray([row[3] for row in ROBOT_DH_TABLES], dtype=np.float32)
+# link twists are constant over a run, so their trig never changes
+_CA = np.cos(_ALPHA)
+_SA = np.sin(_ALPHA)
+
+def _generate_specialized_fk():
+    """Generate a straight-line FK function for the full DH chain.
+
+    The DH table is constant at runtime, so partial-evaluate it: fold the
+    per-joint d/a and cos/sin(alpha) constants into generated source and
+    unroll the chain of 3x4 affine compositions (the bottom row of every
+    DH matrix is [0, 0, 0, 1]). Returns a function q -> (x, y, z).
+    """
+    lines = ["def _fk_full(q):"]
+    for i, (theta0, d, a, alpha) in enumerate(ROBOT_DH_TABLES):
+        ca, sa = math.cos(alpha), math.sin(alpha)
+        lines.append(f"    c = cos(q[{i}] + {float(theta0)!r}); s = sin(q[{i}] + {float(theta0)!r})")
+        lines.append(f"    a00 = c; a01 = -s * {ca!r}; a02 = s * {sa!r}; a03 = {float(a)!r} * c")
+        lines.append(f"    a10 = s; a11 = c * {ca!r}; a12 = -c * {sa!r}; a13 = {float(a)!r} * s")
+        lines.append(f"    a21 = {sa!r}; a22 = {ca!r}; a23 = {float(d)!r}")
+        if i == 0:
+            lines.append("    r00 = a00; r01 = a01; r02 = a02; r03 = a03")
+            lines.append("    r10 = a10; r11 = a11; r12 = a12; r13 = a13")
+            lines.append("    r20 = 0.0; r21 = a21; r22 = a22; r23 = a23")
+        else:
+            for row in range(3):
+                lines.append(
+                    f"    n{row}0 = r{row}0 * a00 + r{row}1 * a10; "
+                    f"n{row}1 = r{row}0 * a01 + r{row}1 * a11 + r{row}2 * a21; "
+                    f"n{row}2 = r{row}0 * a02 + r{row}1 * a12 + r{row}2 * a22; "
+                    f"n{row}3 = r{row}0 * a03 + r{row}1 * a13 + r{row}2 * a23 + r{row}3"
+                )
+            for row in range(3):
+                lines.append(f"    r{row}0 = n{row}0; r{row}1 = n{row}1; r{row}2 = n{row}2; r{row}3 = n{row}3")
+    lines.append("    return (r03, r13, r23)")
+
+    namespace = {"cos": math.cos, "sin": math.sin}
+    exec("\n".join(lines), namespace)
+    return namespace["_fk_full"]
+
+_fk_full = _generate_specialized_fk()
+
+# (theta0, d, a, ca, sa) per joint as plain Python floats for the
+# scalar fallback path
+_DH_SCALAR = [(float(row[0]),) + tuple(map(float, const))
+              for row, const in zip(ROBOT_DH_TABLES, DH_CONST)]
+
+def _fk_scalar(joint_angles):
+    """Hand-unrolled DH chain composition on Python scalars.
+
+    4x4 matmuls this small are dominated by NumPy dispatch overhead, so
+    track only the top 3x4 of the running transform (the bottom row is
+    always [0, 0, 0, 1]) as twelve scalars. Works for any chain prefix.
+    """
+    r00 = 1.0; r01 = 0.0; r02 = 0.0; r03 = 0.0
+    r10 = 0.0; r11 = 1.0; r12 = 0.0; r13 = 0.0
+    r20 = 0.0; r21 = 0.0; r22 = 1.0; r23 = 0.0
+    for q, (theta0, d, a, ca, sa) in zip(joint_angles, _DH_SCALAR):
+        ct = math.cos(q + theta0)
+        st = math.sin(q + theta0)
+        a01 = -st * ca; a02 = st * sa; a03 = a * ct
+        a11 = ct * ca; a12 = -ct * sa; a13 = a * st
+
+        n00 = r00 * ct + r01 * st
+        n01 = r00 * a01 + r01 * a11 + r02 * sa
+        n02 = r00 * a02 + r01 * a12 + r02 * ca
+        n03 = r00 * a03 + r01 * a13 + r02 * d + r03
+        n10 = r10 * ct + r11 * st
+        n11 = r10 * a01 + r11 * a11 + r12 * sa
+        n12 = r10 * a02 + r11 * a12 + r12 * ca
+        n13 = r10 * a03 + r11 * a13 + r12 * d + r13
+        n20 = r20 * ct + r21 * st
+        n21 = r20 * a01 + r21 * a11 + r22 * sa
+        n22 = r20 * a02 + r21 * a12 + r22 * ca
+        n23 = r20 * a03 + r21 * a13 + r22 * d + r23
+
+        r00 = n00; r01 = n01; r02 = n02; r03 = n03
+        r10 = n10; r11 = n11; r12 = n12; r13 = n13
+        r20 = n20; r21 = n21; r22 = n22; r23 = n23
+
+    return (r03, r13, r23)
+
+@njit(cache=True)
 def compute_inverse_kinematics_elbow_desired_pos(x, y, z):
     """Compute inverse kinematics for a 3DOF arm.
 
@@ -23,19 +119,24 @@ def compute_inverse_kinematics_elbow_desired_pos(x, y, z):
 
     """
 
-    joint_1 = np.arctan2(y, x) # base rotation
-    r = np.sqrt(x**2 + y**2)
+    joint_1 = math.atan2(y, x) # base rotation
+    r = math.hypot(x, y)
     delta_r = r - L1 # horizontal distance from shoulder joint
     s = z - L2 # vertical distance from shoulder joint
 
     # Solve standard 2 link inverse kinematics problem
     F = (delta_r**2 + s**2 - L3**2 - L4**2) / (2 * L3 * L4)
 
-    joint_3 = np.arctan2(-np.sqrt(1 - F**2), F)  # elbow flex. 2 solutions, we take the elbow-up one (todo, mayb not?)
-    joint_2 = np.arctan2(s, delta_r) - np.arctan2(L4 * np.sin(joint_3), L3 + L4 * np.cos(joint_3))  # shoulder lift
+    # elbow flex. 2 solutions, we take the elbow-up one (todo, mayb not?)
+    # out-of-reach targets produce NaN, which callers already check for
+    FF = 1 - F**2
+    joint_3 = math.atan2(-math.sqrt(FF), F) if FF >= 0.0 else math.nan
+    joint_2 = math.atan2(s, delta_r) - math.atan2(L4 * math.sin(joint_3), L3 + L4 * math.cos(joint_3))  # shoulder lift
 
-    return np.array([joint_1, joint_2, joint_3])
+    # bare tuple: an ndarray here costs as much as the IK math itself
+    return (joint_1, joint_2, joint_3)
 
+@njit(cache=True)
 def compute_inverse_kinematics_at_desired_wrist_position(x, y, z, wrist_approach_angle=0.0):
     """Compute inverse kinematics for a 3DOF arm with wrist angle consideration.
 
@@ -54,19 +155,66 @@ def compute_inverse_kinematics_at_desired_wrist_position(x, y, z, wrist_approach
 
     # wrist position is desired to be located at the end effector. We need to backtrack L5 along the wrist angle
     # to find the elbow position
-    joint_1 = np.arctan2(y, x) # base rotation angle, needed here
-    elbow_z = z - L5 * np.sin(wrist_approach_angle)
-    wrist_r = L5 * np.cos(wrist_approach_angle)
+    joint_1 = math.atan2(y, x) # base rotation angle, needed here
+    elbow_z = z - L5 * math.sin(wrist_approach_angle)
+    wrist_r = L5 * math.cos(wrist_approach_angle)
 
     # propagate back from end effector to elbow position
-    elbow_x = x - wrist_r * np.cos(joint_1)
-    elbow_y = y - wrist_r * np.sin(joint_1)
+    elbow_x = x - wrist_r * math.cos(joint_1)
+    elbow_y = y - wrist_r * math.sin(joint_1)
 
     elbow_joint_angles = compute_inverse_kinematics_elbow_desired_pos(elbow_x, elbow_y, elbow_z)
     # theta_2 + theta_3 + theta_4 = theta_5
-    # where theta_5 = wrist_approach_angle - np.pi/2
-    joint_4 = wrist_approach_angle - np.pi/2 - (elbow_joint_angles[1] + elbow_joint_angles[2])
-    return np.array([elbow_joint_angles[0], elbow_joint_angles[1], elbow_joint_angles[2], joint_4])
+    # where theta_5 = wrist_approach_angle - PI_2
+    joint_4 = wrist_approach_angle - PI_2 - (elbow_joint_angles[1] + elbow_joint_angles[2])
+    return (elbow_joint_angles[0], elbow_joint_angles[1], elbow_joint_angles[2], joint_4)
+
+
+# warm the JIT cache so the first control-loop tick doesn't pay compile cost
+compute_inverse_kinematics_at_desired_wrist_position(0.17, 0.0, 0.05, 0.0)
+
+
+def compute_ik_batch(xs, ys, zs, wrist_approach_angle=0.0):
+    """Vectorized wrist-position IK over whole trajectories.
+
+    Same math as compute_inverse_kinematics_at_desired_wrist_position but
+    broadcast over (N,) coordinate arrays so a planner or visualizer can
+    solve N samples in one NumPy pass instead of N Python calls.
+
+    Args:
+        xs, ys, zs (np.array): (N,) end effector coordinates.
+        wrist_approach_angle (float or np.array): Desired wrist angle(s) in radians.
+
+    Returns:
+        np.array: (N, 4) joint angles; rows are NaN where out of reach.
+
+    """
+
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    zs = np.asarray(zs, dtype=np.float64)
+
+    base_angle = np.arctan2(ys, xs)
+    elbow_z = zs - L5 * np.sin(wrist_approach_angle)
+    wrist_r = L5 * np.cos(wrist_approach_angle)
+    elbow_x = xs - wrist_r * np.cos(base_angle)
+    elbow_y = ys - wrist_r * np.sin(base_angle)
+
+    # the scalar solver re-derives the base rotation at the elbow position
+    joint_1 = np.arctan2(elbow_y, elbow_x)
+    delta_r = np.hypot(elbow_x, elbow_y) - L1
+    s = elbow_z - L2
+
+    F = (delta_r**2 + s**2 - L3**2 - L4**2) / (2 * L3 * L4)
+    FF = 1 - F**2
+    # out-of-reach samples come back NaN, matching the scalar solver
+    joint_3 = np.where(FF >= 0.0,
+                       np.arctan2(-np.sqrt(np.maximum(FF, 0.0)), F),
+                       np.nan)
+    joint_2 = np.arctan2(s, delta_r) - np.arctan2(L4 * np.sin(joint_3), L3 + L4 * np.cos(joint_3))
+    joint_4 = wrist_approach_angle - PI_2 - (joint_2 + joint_3)
+
+    return np.stack([joint_1, joint_2, joint_3, joint_4], axis=-1)
 
 
 def compute_end_effector_pos_from_joints(joint_angles):
@@ -79,19 +227,104 @@ def compute_end_effector_pos_from_joints(joint_angles):
 
     """
 
-    T = []
-    T_overall = np.eye(4)
-    for i in range(len(joint_angles)):
-        theta = joint_angles[i] + ROBOT_DH_TABLES[i][0]
-        d = ROBOT_DH_TABLES[i][1]
-        a = ROBOT_DH_TABLES[i][2]
-        alpha = ROBOT_DH_TABLES[i][3]
-        T.append(dh_transform_matrix(theta, d, a, alpha))
-        T_overall = T_overall @ T[-1]
-
-    # End effector position
-    end_effector_pos = T_overall[:3, 3]
-    return end_effector_pos
+    n = len(joint_angles)
+    if n == len(ROBOT_DH_TABLES):
+        # full chain hits the jitted kernel, or the straight-line
+        # specialized function when numba is unavailable
+        if fk_njit.NUMBA_AVAILABLE:
+            thetas = np.asarray(joint_angles, dtype=np.float64) + fk_njit.THETA0_ARR
+            pos = fk_njit.fk_position(
+                thetas, fk_njit.D_ARR, fk_njit.A_ARR, fk_njit.CA_ARR, fk_njit.SA_ARR)
+            return pos.astype(np.float32)
+        return np.asarray(_fk_full(joint_angles), dtype=np.float32)
+    # chain prefixes take the hand-unrolled scalar path
+    return np.asarray(_fk_scalar(joint_angles), dtype=np.float32)
+
+@lru_cache(maxsize=4096)
+def _fk_cached(q_key):
+    return compute_end_effector_pos_from_joints(q_key)
+
+def compute_end_effector_pos_from_joints_cached(joint_angles):
+    """FK memoized on joint angles quantized to 1e-5 rad.
+
+    Planner/teach-pendant workloads sample FK at clustered or repeated
+    configurations; caching turns those repeats into a dict lookup. The
+    quantization is far below servo resolution. Callers must not mutate
+    the returned array; check _fk_cached.cache_info() for the hit ratio
+    before relying on this in a new workload.
+    """
+    key = tuple(round(float(q), 5) for q in joint_angles)
+    return _fk_cached(key)
+
+
+def fk_all_origins(joint_angles):
+    """Origins of the base and every joint frame in one cumulative pass.
+
+    Args:
+        joint_angles (np.array): Array of n joint angles.
+    Returns:
+        np.array: (n + 1, 3) positions; row 0 is the base, row i the origin
+        after joint i.
+
+    One forward sweep of the chain yields every intermediate origin, so
+    callers that want the whole skeleton (e.g. the visualizer) avoid
+    re-running FK per prefix (O(n^2) -> O(n)).
+    """
+    q = np.asarray(joint_angles, dtype=np.float64)
+    n = q.shape[0]
+    if fk_njit.NUMBA_AVAILABLE:
+        return fk_njit.fk_all_positions(
+            q + fk_njit.THETA0_ARR[:n], fk_njit.D_ARR[:n], fk_njit.A_ARR[:n],
+            fk_njit.CA_ARR[:n], fk_njit.SA_ARR[:n])
+
+    out = np.zeros((n + 1, 3))
+    T = np.eye(4)
+    buf = np.empty((4, 4))
+    for i, (q_i, (theta0, d, a, ca, sa)) in enumerate(zip(q, _DH_SCALAR)):
+        dh_transform_matrix_fast(q_i + theta0, d, a, ca, sa, out=buf)
+        T = T @ buf
+        out[i + 1] = T[:3, 3]
+    return out
+
+
+def compute_end_effector_pos_from_joints_batch(joint_angles_batch):
+    """Compute end effector positions for a batch of joint configurations.
+
+    Args:
+        joint_angles_batch (np.array): (batch, n) array of joint angles.
+    Returns:
+        np.array: (batch, 3) array of end effector positions.
+
+    """
+
+    q = np.atleast_2d(np.asarray(joint_angles_batch, dtype=np.float32))
+    n = q.shape[1]
+    theta = q + _THETA0[:n]
+    d, a = _D[:n], _A[:n]
+
+    ct, st = np.cos(theta), np.sin(theta)
+    ca, sa = _CA[:n], _SA[:n]
+
+    # (batch, n, 4, 4) stack, collapsed with batched matmuls along the chain
+    T = np.zeros(q.shape + (4, 4), dtype=np.float32)
+    T[..., 0, 0] = ct
+    T[..., 0, 1] = -st * ca
+    T[..., 0, 2] = st * sa
+    T[..., 0, 3] = a * ct
+    T[..., 1, 0] = st
+    T[..., 1, 1] = ct * ca
+    T[..., 1, 2] = -ct * sa
+    T[..., 1, 3] = a * st
+    T[..., 2, 1] = sa
+    T[..., 2, 2] = ca
+    T[..., 2, 3] = d
+    T[..., 3, 3] = 1.0
+
+    T_overall = T[:, 0]
+    for i in range(1, n):
+        T_overall = T_overall @ T[:, i]
+    return T_overall[:, :3, 3]
+
 
 def is_close_to_target(current_pos, target_pos, threshold_m=0.01):
     """Check if the current position is within a threshold distance of the target position.
@@ -1,4 +1,6 @@
-import numpy as np
+import math
+
+PI_2 = math.pi / 2  # folded once; np.pi/2 costs an attribute lookup + divide per use
 
 JOINT_NAMES_AS_INDEX = [
     "shoulder_pan",
@@ -17,4 +19,6 @@ L3 = 0.116
 L4 = 0.1347
 L5 = 0.155 # including gripper length 
 
-beta = np.deg2rad(14.45)  # make reference to dh2.png in README.md
\ No newline at end of file
+# math.radians keeps this a plain Python float: np.deg2rad returns a 0-d
+# NumPy scalar that drags every downstream scalar op through NumPy dispatch
+beta = math.radians(14.45)  # make reference to dh2.png in README.md
\ No newline at end of file
@@ -1,10 +1,7 @@
-# include parent dir
-import sys
-import os
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import math
 
 import numpy as np
-from actuator.kinematics.constants import *
+from actuator.kinematics.constants import L1, L2, L3, L4, L5, PI_2, WRIST_ROLL_MULTIPLIER, beta
 
 """See https://github.com/Argo-Robot/controls/tree/main for derivation"""
 
@@ -18,28 +15,39 @@ ROBOT_DH_TABLES = [
         [0, 0.0, 0.0, 0.0],  # gripper
 ]
 
-def dh_to_mech_angles(q_dh):
-    q_mech = np.zeros_like(q_dh)
+# d, a, alpha never change at runtime, so fold the twist trig once at
+# import. Scalar FK paths iterate this instead of re-reading
+# ROBOT_DH_TABLES and recomputing cos/sin(alpha) per call.
+DH_CONST = [(d, a, math.cos(alpha), math.sin(alpha)) for (_, d, a, alpha) in ROBOT_DH_TABLES]
 
-    q_mech[0] = -q_dh[0]
-    q_mech[1] = -q_dh[1] - beta + np.pi/2
-    q_mech[2] = -q_dh[2] + beta - np.pi/2
-    q_mech[3] = -q_dh[3] - np.pi/2
-    q_mech[4] =  q_dh[4] / WRIST_ROLL_MULTIPLIER * -1.0
-    q_mech[5] = q_dh[5]  # gripper
+# both conversions are affine maps q_out = S * q_in + b with constant sign
+# (plus the wrist-roll scale) and offset vectors, so they collapse to one
+# broadcasted multiply-add; slicing by input length keeps them working for
+# gripper-less 5-joint arrays and whole (batch, n) trajectories alike
+_S_DH2MECH = np.array([-1.0, -1.0, -1.0, -1.0, -1.0 / WRIST_ROLL_MULTIPLIER, 1.0])
+_S_MECH2DH = np.array([-1.0, -1.0, -1.0, -1.0, -WRIST_ROLL_MULTIPLIER, 1.0])
+_B_CONV = np.array([0.0, -beta + PI_2, beta - PI_2, -PI_2, 0.0, 0.0])
 
-    return q_mech
+def dh_to_mech_angles(q_dh):
+    q = np.asarray(q_dh, dtype=np.float64)
+    n = q.shape[-1]
+    return _S_DH2MECH[:n] * q + _B_CONV[:n]
 
 def mech_to_dh_angles(q_mech):
-    joint_1 = q_mech[0] * -1.0
-    joint_2 = q_mech[1] * -1.0 - beta + np.pi/2
-    joint_3 = q_mech[2] * -1.0 + beta - np.pi/2
-    joint_4 = q_mech[3] * -1.0 - np.pi/2
-    joint_5 = q_mech[4] * WRIST_ROLL_MULTIPLIER * -1.0
-    joint_6 = q_mech[5]  # gripper
-    return np.array([joint_1, joint_2, joint_3, joint_4, joint_5, joint_6])
-
-def dh_transform_matrix(theta, d, a, alpha):
+    q = np.asarray(q_mech, dtype=np.float64)
+    n = q.shape[-1]
+    return _S_MECH2DH[:n] * q + _B_CONV[:n]
+
+def _sincos(x):
+    """sin and cos of the same angle, evaluated together.
+
+    Keeps angle-pair trig behind one call site so a compiled backend
+    (numba/Cython) can lower it to a fused sincos; on CPython it is two
+    back-to-back libm calls on an already-hot argument.
+    """
+    return math.sin(x), math.cos(x)
+
+def dh_transform_matrix(theta, d, a, alpha, out=None):
     """Compute the Denavit-Hartenberg transformation matrix.
 
     Args:
@@ -47,19 +55,62 @@ def dh_transform_matrix(theta, d, a, alpha):
         d (float): Link offset.
         a (float): Link length.
         alpha (float): Link twist in radians.
+        out (np.array): Optional preallocated 4x4 buffer to fill in place,
+        avoiding a fresh allocation per call on hot paths. Loops should
+        preallocate one np.empty((4, 4)) as a local (per-thread) buffer
+        and pass it on every iteration.
 
     Returns:
         np.array: 4x4 transformation matrix.
 
     """
-    ct = np.cos(theta)
-    st = np.sin(theta)
-    ca = np.cos(alpha)
-    sa = np.sin(alpha)
-
-    return np.array([
-        [ct, -st * ca, st * sa, a * ct],
-        [st, ct * ca, -ct * sa, a * st],
-        [0, sa, ca, d],
-        [0, 0, 0, 1]
-    ])
+    st, ct = _sincos(theta)
+    sa, ca = _sincos(alpha)
+
+    if out is None:
+        out = np.empty((4, 4))
+    out[0, 0] = ct
+    out[0, 1] = -st * ca
+    out[0, 2] = st * sa
+    out[0, 3] = a * ct
+    out[1, 0] = st
+    out[1, 1] = ct * ca
+    out[1, 2] = -ct * sa
+    out[1, 3] = a * st
+    out[2, 0] = 0.0
+    out[2, 1] = sa
+    out[2, 2] = ca
+    out[2, 3] = d
+    out[3, 0] = 0.0
+    out[3, 1] = 0.0
+    out[3, 2] = 0.0
+    out[3, 3] = 1.0
+    return out
+
+def dh_transform_matrix_fast(theta, d, a, ca, sa, out=None):
+    """Like dh_transform_matrix but takes cos/sin(alpha) precomputed.
+
+    Pair with DH_CONST so scalar loops only pay one cos + one sin per
+    joint instead of two of each.
+    """
+    st, ct = _sincos(theta)
+
+    if out is None:
+        out = np.empty((4, 4))
+    out[0, 0] = ct
+    out[0, 1] = -st * ca
+    out[0, 2] = st * sa
+    out[0, 3] = a * ct
+    out[1, 0] = st
+    out[1, 1] = ct * ca
+    out[1, 2] = -ct * sa
+    out[1, 3] = a * st
+    out[2, 0] = 0.0
+    out[2, 1] = sa
+    out[2, 2] = ca
+    out[2, 3] = d
+    out[3, 0] = 0.0
+    out[3, 1] = 0.0
+    out[3, 2] = 0.0
+    out[3, 3] = 1.0
+    return out
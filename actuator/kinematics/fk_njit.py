@@ -0,0 +1,122 @@
+"""Scalar-unrolled DH forward kinematics, JIT-compiled when numba is present.
+
+The chain is short (6 joints), so per-op NumPy dispatch dominates a naive
+4x4 matmul loop. Unrolling the running transform into 12 scalar
+accumulators (the bottom row of every DH matrix is [0, 0, 0, 1]) lets
+numba compile the whole chain to straight-line machine code.
+"""
+import math
+
+import numpy as np
+from actuator.kinematics.dh_table import ROBOT_DH_TABLES
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional; fall back to plain Python
+    NUMBA_AVAILABLE = False
+    def njit(*args, **kwargs):
+        def wrap(func):
+            return func
+        return wrap
+
+# per-joint constants in float64, laid out as flat arrays for the jitted code
+THETA0_ARR = np.array([row[0] for row in ROBOT_DH_TABLES], dtype=np.float64)
+D_ARR = np.array([row[1] for row in ROBOT_DH_TABLES], dtype=np.float64)
+A_ARR = np.array([row[2] for row in ROBOT_DH_TABLES], dtype=np.float64)
+_ALPHA_ARR = np.array([row[3] for row in ROBOT_DH_TABLES], dtype=np.float64)
+CA_ARR = np.cos(_ALPHA_ARR)
+SA_ARR = np.sin(_ALPHA_ARR)
+
+
+@njit(cache=True)
+def fk_position(thetas, d_arr, a_arr, ca_arr, sa_arr):
+    """End-effector position for joint angles `thetas` (theta0 already added).
+
+    Composes the DH chain with scalar accumulators holding the top 3x4 of
+    the running transform; returns [x, y, z].
+    """
+    r00 = 1.0; r01 = 0.0; r02 = 0.0; r03 = 0.0
+    r10 = 0.0; r11 = 1.0; r12 = 0.0; r13 = 0.0
+    r20 = 0.0; r21 = 0.0; r22 = 1.0; r23 = 0.0
+    for i in range(thetas.shape[0]):
+        ct = math.cos(thetas[i])
+        st = math.sin(thetas[i])
+        ca = ca_arr[i]
+        sa = sa_arr[i]
+        a = a_arr[i]
+        d = d_arr[i]
+        a01 = -st * ca; a02 = st * sa; a03 = a * ct
+        a11 = ct * ca; a12 = -ct * sa; a13 = a * st
+
+        n00 = r00 * ct + r01 * st
+        n01 = r00 * a01 + r01 * a11 + r02 * sa
+        n02 = r00 * a02 + r01 * a12 + r02 * ca
+        n03 = r00 * a03 + r01 * a13 + r02 * d + r03
+        n10 = r10 * ct + r11 * st
+        n11 = r10 * a01 + r11 * a11 + r12 * sa
+        n12 = r10 * a02 + r11 * a12 + r12 * ca
+        n13 = r10 * a03 + r11 * a13 + r12 * d + r13
+        n20 = r20 * ct + r21 * st
+        n21 = r20 * a01 + r21 * a11 + r22 * sa
+        n22 = r20 * a02 + r21 * a12 + r22 * ca
+        n23 = r20 * a03 + r21 * a13 + r22 * d + r23
+
+        r00 = n00; r01 = n01; r02 = n02; r03 = n03
+        r10 = n10; r11 = n11; r12 = n12; r13 = n13
+        r20 = n20; r21 = n21; r22 = n22; r23 = n23
+
+    return np.array([r03, r13, r23])
+
+
+@njit(cache=True)
+def fk_all_positions(thetas, d_arr, a_arr, ca_arr, sa_arr):
+    """Origins of every joint frame plus the base, in one pass.
+
+    Returns an (n + 1, 3) array: row 0 is the base, row i the origin after
+    joint i. Replaces per-prefix FK calls (O(n^2) -> O(n)) for plotting.
+    """
+    n = thetas.shape[0]
+    out = np.zeros((n + 1, 3))
+    r00 = 1.0; r01 = 0.0; r02 = 0.0; r03 = 0.0
+    r10 = 0.0; r11 = 1.0; r12 = 0.0; r13 = 0.0
+    r20 = 0.0; r21 = 0.0; r22 = 1.0; r23 = 0.0
+    for i in range(n):
+        ct = math.cos(thetas[i])
+        st = math.sin(thetas[i])
+        ca = ca_arr[i]
+        sa = sa_arr[i]
+        a = a_arr[i]
+        d = d_arr[i]
+        a01 = -st * ca; a02 = st * sa; a03 = a * ct
+        a11 = ct * ca; a12 = -ct * sa; a13 = a * st
+
+        n00 = r00 * ct + r01 * st
+        n01 = r00 * a01 + r01 * a11 + r02 * sa
+        n02 = r00 * a02 + r01 * a12 + r02 * ca
+        n03 = r00 * a03 + r01 * a13 + r02 * d + r03
+        n10 = r10 * ct + r11 * st
+        n11 = r10 * a01 + r11 * a11 + r12 * sa
+        n12 = r10 * a02 + r11 * a12 + r12 * ca
+        n13 = r10 * a03 + r11 * a13 + r12 * d + r13
+        n20 = r20 * ct + r21 * st
+        n21 = r20 * a01 + r21 * a11 + r22 * sa
+        n22 = r20 * a02 + r21 * a12 + r22 * ca
+        n23 = r20 * a03 + r21 * a13 + r22 * d + r23
+
+        r00 = n00; r01 = n01; r02 = n02; r03 = n03
+        r10 = n10; r11 = n11; r12 = n12; r13 = n13
+        r20 = n20; r21 = n21; r22 = n22; r23 = n23
+
+        out[i + 1, 0] = r03
+        out[i + 1, 1] = r13
+        out[i + 1, 2] = r23
+
+    return out
+
+
+if NUMBA_AVAILABLE:
+    # warm the JIT cache so the first control-loop tick doesn't pay compile cost
+    _warm = np.zeros(len(ROBOT_DH_TABLES))
+    fk_position(_warm + THETA0_ARR, D_ARR, A_ARR, CA_ARR, SA_ARR)
+    fk_all_positions(_warm + THETA0_ARR, D_ARR, A_ARR, CA_ARR, SA_ARR)
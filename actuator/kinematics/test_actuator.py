@@ -1,9 +1,27 @@
+import numpy as np
 import pytest
-from actuator.kinematics.arm_kinematics import *
+from actuator.kinematics.arm_kinematics import compute_end_effector_pos_from_joints
+from actuator.kinematics.dh_table import (
+    ROBOT_DH_TABLES,
+    dh_to_mech_angles,
+    dh_transform_matrix,
+    mech_to_dh_angles,
+)
 
 def test_mech_to_dh_and_back():
     """Test conversion between mech and DH angles."""
     mech_angles = np.array([0.0, np.pi/4, -np.pi/4, 0.0, 0.0])
     dh_angles = mech_to_dh_angles(mech_angles)
     mech_converted = dh_to_mech_angles(dh_angles)
-    assert np.allclose(mech_angles, mech_converted), "Mech to DH conversion failed."
\ No newline at end of file
+    assert np.allclose(mech_angles, mech_converted), "Mech to DH conversion failed."
+
+def test_fk_float32_accuracy():
+    """FK in float32 should stay within 1e-4 m of a float64 reference."""
+    joint_angles = np.deg2rad([10.0, 45.0, -30.0, 20.0, 5.0, 0.0])
+    T = np.eye(4)
+    for i in range(len(joint_angles)):
+        theta = joint_angles[i] + ROBOT_DH_TABLES[i][0]
+        T = T @ dh_transform_matrix(theta, *ROBOT_DH_TABLES[i][1:4])
+    ref_pos = T[:3, 3]
+    pos = compute_end_effector_pos_from_joints(joint_angles)
+    assert np.allclose(pos, ref_pos, atol=1e-4), "float32 FK drifted from float64 reference."
\ No newline at end of file
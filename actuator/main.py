@@ -1,9 +1,9 @@
 from gen.SOARM100_ROBOT_ARM_hcp_support import HCPClient
+import math
 import time
 import queue
-import numpy as np
-from copy import deepcopy
-from actuator_layer import ActuatorLayer, Mode, ActuatorLayerRequest   
+from dataclasses import replace
+from actuator_layer import ActuatorLayer, Mode, ActuatorLayerRequest
 
 client = HCPClient()
 client.start()
@@ -12,30 +12,46 @@ requestActive = False
 
 actuator_layer = ActuatorLayer(Mode.AUTONOMOUS, use_visualizer=True, dry_run=False, virtual=False)
 
+CONTROL_PERIOD_S = 0.01
+next_tick = time.monotonic() + CONTROL_PERIOD_S
+
+# O(1) dict dispatch instead of a string-comparison chain per event; each
+# handler mutates the request copy in place
+def _handle_move_arm(request, payload):
+    request.x_m = payload.get("x", 0)/1000
+    request.y_m = payload.get("y", 0)/1000
+    request.z_m = payload.get("z", 0)/1000
+
+def _handle_control_grip(request, payload):
+    closed = payload.get("closed", False)
+    request.gripper_cmd = 0.0 if closed else 1.0
+
+def _handle_set_wrist_angle(request, payload):
+    angle = payload.get("angle", 0.0)
+    request.wrist_angle_rad = math.radians(angle)
+
+ACTION_HANDLERS = {
+    "move_arm": _handle_move_arm,
+    "control_grip": _handle_control_grip,
+    "set_wrist_angle": _handle_set_wrist_angle,
+}
+
 while True:
     actuator_layer.step()
     try:
-        # Non-blocking check for new HCP commands
-        action, payload = client.events.get_nowait()        
+        # Block for new HCP commands until the next control tick is due,
+        # so the loop sleeps in the queue instead of busy-polling
+        timeout = max(0.0, next_tick - time.monotonic())
+        action, payload = client.events.get(timeout=timeout)
         print(f"[EVENT] {action}: {payload}")
-        prev_request = deepcopy(actuator_layer.request)
-        
+        # flat dataclass of primitives: a field-level copy is all we need
+        prev_request = replace(actuator_layer.request)
+
         request = prev_request
 
-        if (action == "move_arm"):
-            request.x_m = payload.get("x", 0)/1000
-            request.y_m = payload.get("y", 0)/1000
-            request.z_m = payload.get("z", 0)/1000
-            actuator_layer.request_position(request)
-        elif (action == "control_grip"):
-            closed = payload.get("closed", False)
-            gripper_cmd = 0.0 if closed else 1.0
-            request = prev_request
-            request.gripper_cmd = gripper_cmd
-            actuator_layer.request_position(request)
-        elif (action == "set_wrist_angle"):
-            angle = payload.get("angle", 0.0)
-            request.wrist_angle_rad = np.deg2rad(angle)
+        handler = ACTION_HANDLERS.get(action)
+        if handler is not None:
+            handler(request, payload)
             actuator_layer.request_position(request)
 
         # handle the command
@@ -47,12 +63,18 @@ while True:
 
     if requestActive:
         is_actuator_close_to_target_now = actuator_layer.is_close_to_target()
-        print(f"Is actuator close to target? {is_actuator_close_to_target_now}")
         # send the response back to HCP
         if is_actuator_close_to_target_now:
             print("[EVENT] reached_target")
             client.send_response(action, result)
             requestActive = False
 
-    # other main loop tasks
-    time.sleep(0.01)
\ No newline at end of file
+    # pace steps against a monotonic deadline so the control rate doesn't
+    # drift with per-iteration processing time
+    remaining = next_tick - time.monotonic()
+    if remaining > 0:
+        time.sleep(remaining)
+        next_tick += CONTROL_PERIOD_S
+    else:
+        # fell behind (e.g. long command burst); resync rather than rush
+        next_tick = time.monotonic() + CONTROL_PERIOD_S
\ No newline at end of file
@@ -1,10 +1,13 @@
+import time
+
 import matplotlib.pyplot as plt
 import numpy as np
-from collections import deque
-from actuator.kinematics.arm_kinematics import compute_end_effector_pos_from_joints
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
+from actuator.kinematics.arm_kinematics import fk_all_origins
 
 class Visualizer:
-    def __init__(self, base_coordinate_marker_size=0.01, trail_len=100):
+    def __init__(self, base_coordinate_marker_size=0.01, trail_len=100, camera_drift=False,
+                 target_fps=30.0):
         self.fig = plt.figure()
         self.ax = self.fig.add_subplot(111, projection='3d')
 
@@ -19,84 +22,133 @@ class Visualizer:
             axis.pane.set_facecolor((0.92, 0.92, 0.98, 0.6))
 
         self.base_axes_len = float(base_coordinate_marker_size)
-        self.ee_traj = deque(maxlen=int(trail_len))
+        # EE trail lives in a fixed ring buffer; appending is one row store
+        # instead of a deque push plus a full vstack copy every frame
+        self._trail = np.empty((int(trail_len), 3))
+        self._trail_head = 0
+        self._trail_count = 0
+        # a moving camera forces a full reprojection every frame even when
+        # nothing else changed, so the drift is opt-in
+        self._camera_drift = bool(camera_drift)
+        # redraws are capped at target_fps so a fast control loop isn't
+        # paced by the renderer; artist data still updates every call
+        self._min_draw_interval = 1.0 / float(target_fps)
+        self._last_draw = 0.0
+        # last plotted state; unchanged frames cost nothing at all
+        self._last_q = None
+        self._last_target = None
 
         self.ax.set_xlabel('X axis')
         self.ax.set_ylabel('Y axis')
         self.ax.set_zlabel('Z axis')
         self.ax.set_title('Robotic Arm Visualization')
+
+        # Persistent artists, created once and updated in place each frame;
+        # clearing and rebuilding the axes per frame is the dominant cost of
+        # interactive matplotlib, not the drawing itself
+        self._draw_base_triad()
+        self._link_line, = self.ax.plot([], [], [], linewidth=3.0, alpha=0.9)
+        self._joint_scatter = self.ax.scatter([], [], [], s=25, depthshade=True)
+        self._base_scatter = self.ax.scatter([0.0], [0.0], [0.0], s=40, depthshade=True)
+        self._ee_scatter = self.ax.scatter([], [], [], s=70, depthshade=True)
+        self._target_scatter = self.ax.scatter([], [], [], s=60, marker='x')
+        self._target_line, = self.ax.plot([], [], [], linestyle='--', linewidth=1.5, alpha=0.7)
+        self._trail_line, = self.ax.plot([], [], [], linewidth=1.5, alpha=0.6)
+
+        # current axis limits; only re-run the (expensive) relayout when the
+        # scene outgrows them or shrinks well inside them
+        self._lim_low = None
+        self._lim_high = None
+
         plt.ion()
         plt.show(block=False)
 
     def _draw_base_triad(self):
         L = self.base_axes_len
-        O = np.array([0.0, 0.0, 0.0])
+        O = (0.0, 0.0, 0.0)
 
-        # Axis triad
-        self.ax.quiver(O[0], O[1], O[2], L, 0, 0, length=1.0, normalize=False, arrow_length_ratio=0.15)
-        self.ax.quiver(O[0], O[1], O[2], 0, L, 0, length=1.0, normalize=False, arrow_length_ratio=0.15)
-        self.ax.quiver(O[0], O[1], O[2], 0, 0, L, length=1.0, normalize=False, arrow_length_ratio=0.15)
+        # Axis triad: one static collection instead of three quivers, so the
+        # per-frame projection pass walks a single artist
+        segments = [(O, (L, 0.0, 0.0)), (O, (0.0, L, 0.0)), (O, (0.0, 0.0, L))]
+        colors = [(0.8, 0.1, 0.1), (0.1, 0.6, 0.1), (0.1, 0.1, 0.8)]
+        self.ax.add_collection3d(Line3DCollection(segments, colors=colors, linewidths=1.5))
         # Labels
         self.ax.text(L, 0, 0, 'X', fontsize=9, ha='left', va='bottom')
         self.ax.text(0, L, 0, 'Y', fontsize=9, ha='left', va='bottom')
         self.ax.text(0, 0, L, 'Z', fontsize=9, ha='left', va='bottom')
 
+    def _maybe_rescale(self, low, high):
+        """Re-run axis limits/aspect layout only when the scene demands it."""
+        if self._lim_low is not None:
+            grew = (low < self._lim_low).any() or (high > self._lim_high).any()
+            shrank = ((high - low) < 0.5 * (self._lim_high - self._lim_low)).any()
+            if not grew and not shrank:
+                return
+        self._lim_low = low
+        self._lim_high = high
+        self.ax.set_xlim(low[0], high[0])
+        self.ax.set_ylim(low[1], high[1])
+        self.ax.set_zlim(low[2], high[2])
+        self.ax.set_box_aspect((high - low))
+
     def plot(self, joint_positions, target=None):
         """
         Plot the arm skeleton (base -> joints -> end-effector), optional target, and EE trail.
 
         Args:
             joint_positions: iterable of joint angles (radians) expected by
-                             compute_end_effector_pos_from_joints().
+                             fk_all_origins().
             target: optional (x, y, z) tuple/array to draw as a marker.
         """
-        # Clear and relabel
-        self.ax.cla()
-        self.ax.set_xlabel('X axis')
-        self.ax.set_ylabel('Y axis')
-        self.ax.set_zlabel('Z axis')
-        self.ax.set_title('Robotic Arm Visualization')
-        self.ax.grid(True, alpha=0.25)
-
-        # Base coordinate marker (triad)
-        self._draw_base_triad()
-
-        # Collect points: base -> joints -> EE
-        points = [np.array([0.0, 0.0, 0.0], dtype=float)]
+        # Static joints and target mean nothing on screen moved: skip the
+        # FK sweep, artist updates and redraw entirely
         q = np.asarray(joint_positions, dtype=float)
-        n = len(q)
-
-        for idx in range(1, n + 1):
-            # FK for first idx joints
-            ee_pos = compute_end_effector_pos_from_joints(q[:idx])
-            p = np.asarray(ee_pos, dtype=float).reshape(3)
-            points.append(p)
-
-        pts = np.vstack(points)  # (n+1, 3)
+        tgt = None if target is None else np.asarray(target, dtype=float).reshape(3)
+        if (self._last_q is not None
+                and np.array_equal(self._last_q, q)
+                and ((tgt is None and self._last_target is None)
+                     or (tgt is not None and self._last_target is not None
+                         and np.array_equal(self._last_target, tgt)))):
+            return
+        self._last_q = q.copy()
+        self._last_target = None if tgt is None else tgt.copy()
+
+        # Collect points: base -> joints -> EE, one cumulative FK sweep
+        pts = fk_all_origins(q)  # (n+1, 3)
         xs, ys, zs = pts[:, 0], pts[:, 1], pts[:, 2]
 
-        # Links + joints styling
-        self.ax.plot(xs, ys, zs, linewidth=3.0, alpha=0.9)
-        self.ax.scatter(xs[1:-1], ys[1:-1], zs[1:-1], s=25, depthshade=True)  # intermediate joints
-        self.ax.scatter(xs[0], ys[0], zs[0], s=40, depthshade=True)           # base
-        self.ax.scatter(xs[-1], ys[-1], zs[-1], s=70, depthshade=True)        # EE
+        # Links + joints: update persistent artists in place
+        self._link_line.set_data_3d(xs, ys, zs)
+        self._joint_scatter._offsets3d = (xs[1:-1], ys[1:-1], zs[1:-1])  # intermediate joints
+        self._ee_scatter._offsets3d = ([xs[-1]], [ys[-1]], [zs[-1]])     # EE
 
         # Optional target + line from EE to target
-        if target is not None:
-            tx, ty, tz = np.asarray(target, dtype=float).reshape(3)
-            self.ax.scatter([tx], [ty], [tz], s=60, marker='x')
-            self.ax.plot([xs[-1], tx], [ys[-1], ty], [zs[-1], tz], linestyle='--', linewidth=1.5, alpha=0.7)
+        if tgt is not None:
+            tx, ty, tz = tgt
+            self._target_scatter._offsets3d = ([tx], [ty], [tz])
+            self._target_line.set_data_3d([xs[-1], tx], [ys[-1], ty], [zs[-1], tz])
+        else:
+            self._target_scatter._offsets3d = ([], [], [])
+            self._target_line.set_data_3d([], [], [])
 
         # EE trail (smooth motion feel)
-        self.ee_traj.append(pts[-1])
-        if len(self.ee_traj) > 1:
-            tr = np.vstack(self.ee_traj)
-            self.ax.plot(tr[:, 0], tr[:, 1], tr[:, 2], linewidth=1.5, alpha=0.6)
+        trail_len = self._trail.shape[0]
+        self._trail[self._trail_head] = pts[-1]
+        self._trail_head = (self._trail_head + 1) % trail_len
+        if self._trail_count < trail_len:
+            self._trail_count += 1
+        if self._trail_count > 1:
+            if self._trail_count < trail_len:
+                tr = self._trail[:self._trail_count]
+            else:
+                # rotate into chronological order only once the ring is full
+                tr = np.roll(self._trail, -self._trail_head, axis=0)
+            self._trail_line.set_data_3d(tr[:, 0], tr[:, 1], tr[:, 2])
 
         # Auto-scale with margin; equal aspect
         all_pts = pts.copy()
-        if target is not None:
-            all_pts = np.vstack([all_pts, np.array([tx, ty, tz])])
+        if tgt is not None:
+            all_pts = np.vstack([all_pts, tgt])
 
         mins = all_pts.min(axis=0)
         maxs = all_pts.max(axis=0)
@@ -106,17 +158,20 @@ class Visualizer:
         margin = 0.20 * max_range
         low = center - 0.5 * max_range - margin
         high = center + 0.5 * max_range + margin
+        self._maybe_rescale(low, high)
 
-        self.ax.set_xlim(low[0], high[0])
-        self.ax.set_ylim(low[1], high[1])
-        self.ax.set_zlim(low[2], high[2])
-        self.ax.set_box_aspect((high - low))
+        # Skip the actual redraw if one happened within the FPS budget;
+        # the artists above already hold the latest state for the next draw
+        now = time.perf_counter()
+        if now - self._last_draw < self._min_draw_interval:
+            return
+        self._last_draw = now
 
         # Subtle camera drift to avoid static feel (optional)
-        elev, azim = self.ax.elev, self.ax.azim
-        self.ax.view_init(elev=elev, azim=azim + 0.2)
+        if self._camera_drift:
+            elev, azim = self.ax.elev, self.ax.azim
+            self.ax.view_init(elev=elev, azim=azim + 0.2)
 
         # Draw now
         self.fig.canvas.draw_idle()
         self.fig.canvas.flush_events()
-        plt.pause(0.001)
@@ -11,6 +11,9 @@ from actuator.kinematics.arm_kinematics import *
 from actuator.kinematics.constants import *
 from actuator.utils.detect_serial import detect_so101_ports
 
+# observation keys are fixed; format them once instead of every tick
+_POS_KEYS = tuple(f"{joint}.pos" for joint in JOINT_NAMES_AS_INDEX)
+
 ports = detect_so101_ports()
 
 robot_config = SO101FollowerConfig(
@@ -28,22 +31,31 @@ teleop_config = SO101LeaderConfig(
 teleop_device = SO101Leader(teleop_config)
 teleop_device.connect()
 
+# per-tick buffers, filled in place: one vectorized deg2rad instead of
+# building two Python lists and converting element by element
+_joint_buf = np.empty(len(JOINT_NAMES_AS_INDEX))
+_rad_buf = np.empty(len(JOINT_NAMES_AS_INDEX))
+
 while True:
     action = teleop_device.get_action()
     robot.send_action(action)
     robot_pos = robot.get_observation()
     print(robot_pos)
-    joint_angles = [robot_pos[f"{joint}.pos"] for joint in JOINT_NAMES_AS_INDEX]
-    joint_angles_rad = [np.deg2rad(angle) for angle in joint_angles]
-    joint_angles_dh = mech_to_dh_angles(joint_angles_rad)
+    for i, key in enumerate(_POS_KEYS):
+        _joint_buf[i] = robot_pos[key]
+    np.deg2rad(_joint_buf, out=_rad_buf)
+    joint_angles_dh = mech_to_dh_angles(_rad_buf)
     for i in range(len(joint_angles_dh)):
         print(f"Joint {i+1} Angle (DH): {np.rad2deg(joint_angles_dh[i]):.2f} degrees")
-    end_effector_pos = compute_end_effector_pos_from_joints(np.array(joint_angles_dh))
+    # one cumulative FK sweep gives every joint origin: the EE is the last
+    # row and the 3rd joint falls out at index 3, replacing two separate
+    # chain evaluations per tick
+    joint_origins = fk_all_origins(joint_angles_dh)
+    end_effector_pos = joint_origins[-1]
     print(f"End Effector Position: x={end_effector_pos[0]:.3f}, y={end_effector_pos[1]:.3f}, z={end_effector_pos[2]:.3f}")
 
     # solve for inverse kinematics position of the 3rd joint
-    joint_angles_for_ik_solution = joint_angles_dh[:3]
-    pos_of_third_joint = compute_end_effector_pos_from_joints(np.array(joint_angles_for_ik_solution))
+    pos_of_third_joint = joint_origins[3]
     ik_solution = compute_inverse_kinematics_elbow_desired_pos(
         pos_of_third_joint[0],
         pos_of_third_joint[1],
@@ -4,11 +4,18 @@ ASI1Client — Python client for Fetch.ai's ASI:One Mini API
 https://innovationlab.fetch.ai/resources/docs/asione/asi1-mini-api-reference
 """
 
+import json
 import os
 import requests
+from requests.adapters import HTTPAdapter
 from typing import List, Dict, Optional, Generator
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib encoding works, just slower
+    orjson = None
+
 # Load .env file if present
 load_dotenv()
 
@@ -46,6 +53,10 @@ class ASI1Client:
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         })
+        # one pinned keep-alive connection: every call hits the same host,
+        # so reconnect/TLS setup should never appear on the chat hot path
+        self._session.mount(self.BASE_URL, HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        self._chat_url = f"{self.BASE_URL}/chat/completions"
 
     # ------------------------
     # Internal utility methods
@@ -87,7 +98,6 @@ class ASI1Client:
         Returns:
             JSON dict response (if stream=False). Otherwise, returns raw response stream object.
         """
-        url = f"{self.BASE_URL}/chat/completions"
         payload = {"model": self.model, "messages": messages}
         if temperature is not None:
             payload["temperature"] = temperature
@@ -96,7 +106,12 @@ class ASI1Client:
         if stream:
             payload["stream"] = True
 
-        resp = self._session.post(url, json=payload, stream=stream)
+        # orjson encodes straight to bytes; the session already carries the
+        # application/json content type
+        if orjson is not None:
+            resp = self._session.post(self._chat_url, data=orjson.dumps(payload), stream=stream)
+        else:
+            resp = self._session.post(self._chat_url, json=payload, stream=stream)
         if stream:
             return resp
         return self._handle_response(resp)
@@ -127,24 +142,37 @@ class ASI1Client:
                 f"Streaming request failed [{resp.status_code}]: {resp.text}"
             )
 
-        for line in resp.iter_lines(decode_unicode=True):
-            if not line or not line.startswith("data: "):
-                continue
-
-            data = line[len("data: "):].strip()
-            if data == "[DONE]":
-                break
-
-            try:
-                obj = requests.utils.json.loads(data)
-            except Exception:
+        # parse the SSE stream as bytes: only lines that actually carry
+        # content ever get decoded, and the line scanning stays in C-level
+        # bytes operations instead of per-line unicode decode
+        buf = bytearray()
+        for raw in resp.iter_content(chunk_size=4096):
+            if not raw:
                 continue
-
-            for choice in obj.get("choices", []):
-                delta = choice.get("delta", {})
-                content = delta.get("content")
-                if content:
-                    yield content
+            buf += raw
+            while True:
+                nl = buf.find(b"\n")
+                if nl < 0:
+                    break
+                line = bytes(buf[:nl]).rstrip(b"\r")
+                del buf[:nl + 1]
+                if not line.startswith(b"data: "):
+                    continue
+
+                data = line[6:].strip()
+                if data == b"[DONE]":
+                    return
+
+                try:
+                    obj = orjson.loads(data) if orjson is not None else json.loads(data)
+                except Exception:
+                    continue
+
+                for choice in obj.get("choices", []):
+                    delta = choice.get("delta", {})
+                    content = delta.get("content")
+                    if content:
+                        yield content
 
     # ------------------------
     # Convenience methods
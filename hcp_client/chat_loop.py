@@ -6,8 +6,14 @@ Make sure you have:
   - .env file with ASI1_API_KEY=<your_api_key>
 """
 
+from collections import deque
+
 from asi1client import ASI1Client, ASI1ClientError
 
+# history window: the payload per request stays O(window) instead of the
+# whole transcript, which grows quadratically in bytes over a session
+MAX_TURNS = 20
+
 
 def main():
     print("=== ASI1 Chat ===")
@@ -19,10 +25,10 @@ def main():
         print(f"Error initializing ASI1Client: {e}")
         return
 
-    # Keep full conversation for context
-    messages = [
-        {"role": "system", "content": "You are a helpful and knowledgeable AI assistant."}
-    ]
+    # System prompt stays pinned; user/assistant turns live in a bounded
+    # deque that silently drops the oldest messages once full
+    system_msg = {"role": "system", "content": "You are a helpful and knowledgeable AI assistant."}
+    history = deque(maxlen=MAX_TURNS * 2)
 
     while True:
         try:
@@ -38,17 +44,17 @@ def main():
             continue
 
         # Add user message to history
-        messages.append({"role": "user", "content": user_input})
+        history.append({"role": "user", "content": user_input})
 
         try:
             # Normal (non-streaming) completion
-            response = client.chat_completion(messages)
+            response = client.chat_completion([system_msg, *history])
             ai_reply = response["choices"][0]["message"]["content"].strip()
 
             print(f"AI: {ai_reply}\n")
 
             # Add assistant message to history
-            messages.append({"role": "assistant", "content": ai_reply})
+            history.append({"role": "assistant", "content": ai_reply})
 
         except ASI1ClientError as e:
             print(f"[Error] {e}")
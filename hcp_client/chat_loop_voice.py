@@ -7,7 +7,9 @@ Requires:
 
 import re
 import time
+import queue
 import threading
+from collections import deque
 import pyttsx3
 import speech_recognition as sr
 import keyboard
@@ -19,8 +21,63 @@ def is_hardware_command(text: str) -> bool:
     return bool(re.search(r"(move_to|pincer|\{|\[|:)", text, re.I))
 
 
+# a sentence is speakable as soon as its terminator arrives
+_SENTENCE_END = re.compile(r"[.!?](?:\s|$)")
+
+# history window: bounds the per-request payload, which otherwise grows
+# quadratically in bytes over a long voice session
+MAX_TURNS = 20
+
+# one engine for the whole process: pyttsx3.init() costs 50-200ms per
+# call, so a single daemon worker drains a queue of utterances instead
+# of every utterance re-initializing the driver
+_tts_q: "queue.Queue[str]" = queue.Queue()
+_tts_engine = None
+_tts_thread = None
+_tts_start_lock = threading.Lock()
+
+
+def _tts_loop():
+    global _tts_engine
+    try:
+        _tts_engine = pyttsx3.init()
+        _tts_engine.setProperty("rate", 175)
+    except Exception as e:
+        print(f"[TTS error] {e}")
+        return
+    while True:
+        text = _tts_q.get()
+        try:
+            _tts_engine.say(text)
+            _tts_engine.runAndWait()
+        except Exception as e:
+            print(f"[TTS error] {e}")
+
+
+def _ensure_tts_worker():
+    global _tts_thread
+    with _tts_start_lock:
+        if _tts_thread is None or not _tts_thread.is_alive():
+            _tts_thread = threading.Thread(target=_tts_loop, daemon=True)
+            _tts_thread.start()
+
+
+def stop_speaking():
+    """Barge-in support: drop queued sentences and halt the current one."""
+    while True:
+        try:
+            _tts_q.get_nowait()
+        except queue.Empty:
+            break
+    if _tts_engine is not None:
+        try:
+            _tts_engine.stop()
+        except Exception as e:
+            print(f"[TTS error] {e}")
+
+
 def speak_text(text: str):
-    """Speak text safely in a background thread."""
+    """Queue text for the persistent TTS worker."""
     if not text.strip():
         return
     if is_hardware_command(text):
@@ -29,19 +86,8 @@ def speak_text(text: str):
         return
 
     print(f"\nAI: {text}\n")
-
-    def tts_worker():
-        try:
-            engine = pyttsx3.init()
-            engine.setProperty("rate", 175)
-            engine.say(text)
-            engine.runAndWait()
-            time.sleep(0.1)
-            engine.stop()
-        except Exception as e:
-            print(f"[TTS error] {e}")
-
-    threading.Thread(target=tts_worker, daemon=True).start()
+    _ensure_tts_worker()
+    _tts_q.put(text)
 
 
 def listen_to_speech(recognizer: sr.Recognizer, mic: sr.Microphone) -> str:
@@ -49,6 +95,7 @@ def listen_to_speech(recognizer: sr.Recognizer, mic: sr.Microphone) -> str:
     print("\n🎙️ Hold SPACE to talk... (release when done)")
 
     keyboard.wait("space")
+    stop_speaking()  # barge-in: talking interrupts any queued speech
 
     with mic as source:
         recognizer.adjust_for_ambient_noise(source, duration=0.3)
@@ -83,9 +130,10 @@ def main():
         print(f"Error initializing ASI1Client: {e}")
         return
 
-    messages = [
-        {"role": "system", "content": "You are a helpful AI assistant that can control hardware if asked."}
-    ]
+    # System prompt stays pinned; user/assistant turns live in a bounded
+    # deque that silently drops the oldest messages once full
+    system_msg = {"role": "system", "content": "You are a helpful AI assistant that can control hardware if asked."}
+    history = deque(maxlen=MAX_TURNS * 2)
 
     while True:
         user_input = listen_to_speech(recognizer, mic)
@@ -96,13 +144,26 @@ def main():
             speak_text("Goodbye!")
             break
 
-        messages.append({"role": "user", "content": user_input})
+        history.append({"role": "user", "content": user_input})
 
         try:
-            response = client.chat_completion(messages)
-            ai_reply = response["choices"][0]["message"]["content"].strip()
-            speak_text(ai_reply)
-            messages.append({"role": "assistant", "content": ai_reply})
+            # stream the completion and start speaking each sentence as soon
+            # as it is complete, overlapping TTS with LLM generation instead
+            # of waiting for the whole reply
+            reply_parts = []
+            pending = ""
+            for delta in client.chat_completion_stream([system_msg, *history]):
+                reply_parts.append(delta)
+                pending += delta
+                match = _SENTENCE_END.search(pending)
+                while match:
+                    speak_text(pending[:match.end()].strip())
+                    pending = pending[match.end():]
+                    match = _SENTENCE_END.search(pending)
+            if pending.strip():
+                speak_text(pending.strip())
+            ai_reply = "".join(reply_parts).strip()
+            history.append({"role": "assistant", "content": ai_reply})
         except ASI1ClientError as e:
             print(f"[Error] {e}")
             speak_text("There was an error with the AI service.")
@@ -1,15 +1,26 @@
 from typing import Any, Dict, List, Tuple, Optional
+import collections
+import selectors
 import socket
 import json
 import threading
 from dataclasses import dataclass, field
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json works, just slower
+    orjson = None
+
+_MISSING = object()  # sentinel: one dict lookup for presence + value
+
 @dataclass
 class Client:
     conn: socket.socket
     addr: tuple
     thread: threading.Thread
     alive: bool = field(default=True)
+    # outbound frame buffers, drained by the executor's writer thread
+    out: collections.deque = field(default_factory=collections.deque)
 
 class HCPExecutor:
     def __init__(self):
@@ -27,18 +38,93 @@ class HCPExecutor:
         #   }
         # }
         self.devices: Dict[str, Dict[str, Any]] = {}
+        # registrations happen once at startup but the LLM context string is
+        # injected into every chat turn, so build it once and reuse it
+        self._llm_ctx_cache: Optional[str] = None
+
+        # Non-blocking send machinery: execute_action only enqueues framed
+        # bytes; a single writer thread drains per-client queues as sockets
+        # become writable, so a slow device never stalls the caller.
+        self._selector = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ)
+        self._pending_lock = threading.Lock()
+        self._pending: List[Client] = []
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    # ---------- Background writer ----------
+    def _write_loop(self):
+        while True:
+            for key, _ in self._selector.select():
+                if key.fileobj is self._wake_r:
+                    try:
+                        while self._wake_r.recv(4096):
+                            pass
+                    except BlockingIOError:
+                        pass
+                    with self._pending_lock:
+                        pending, self._pending = self._pending, []
+                    for client in pending:
+                        if client.out:
+                            try:
+                                self._selector.register(client.conn, selectors.EVENT_WRITE, client)
+                            except KeyError:
+                                pass  # already registered
+                    continue
+                if not self._drain(key.data):
+                    self._selector.unregister(key.fileobj)
+
+    def _drain(self, client: Client) -> bool:
+        """Send queued frames; return True while more remains unsent."""
+        out = client.out
+        try:
+            while out:
+                if hasattr(client.conn, "sendmsg"):
+                    # scatter-gather: flush several queued frames per syscall
+                    bufs = [out[i] for i in range(min(len(out), 16))]
+                    sent = client.conn.sendmsg(bufs)
+                else:
+                    sent = client.conn.send(out[0])
+                while sent:
+                    head = out[0]
+                    if sent >= len(head):
+                        sent -= len(head)
+                        out.popleft()
+                    else:
+                        out[0] = head[sent:]
+                        sent = 0
+        except (BlockingIOError, InterruptedError):
+            return True
+        except OSError as e:
+            print(f"⚠️ TCP send failed for {client.addr} — {e}")
+            out.clear()
+            return False
+        return False
 
     # ---------- Registration ----------
     def register_device(self, device_id: str, description: str, port: int, client: Client):
         """Register a hardware device reachable over TCP."""
         if device_id in self.devices:
             raise ValueError(f"Device '{device_id}' already registered.")
+        if client is not None and client.conn is not None:
+            try:
+                # commands are small and latency-sensitive; without NODELAY,
+                # Nagle can hold them back ~40ms waiting for an ACK
+                client.conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            except OSError:
+                pass
+            # sends go through the writer thread's selector, never a
+            # blocking sendall in the caller
+            client.conn.setblocking(False)
         self.devices[device_id] = {
             "description": description,
             "port": port,
             "client": client,
             "actions": {}
         }
+        self._llm_ctx_cache = None
 
     def register_action(
         self,
@@ -55,8 +141,17 @@ class HCPExecutor:
             raise ValueError(f"Action '{action_name}' already registered for '{device_id}'.")
         device["actions"][action_name] = {
             "description": description,
-            "params": params
+            "params": params,
+            # precomputed so validate_payload checks membership against a
+            # frozenset instead of rebuilding a name list per call
+            "param_names": frozenset(name for name, _ in params),
+            # wire frame is {"action": <name>, "payload": ...}; the action
+            # name is fixed at registration, so bake the envelope prefix
+            # once and sends only serialize the payload
+            "frame_prefix": b'{"action":"' + action_name.encode("utf-8") + b'","payload":',
         }
+        device.pop("llm_ctx", None)
+        self._llm_ctx_cache = None
 
     # ---------- Validation ----------
     def validate_payload(self, device_id: str, action_name: str, payload: Dict[str, Any]) -> bool:
@@ -71,18 +166,19 @@ class HCPExecutor:
             return False
 
         for param_name, param_type in action["params"]:
-            if param_name not in payload:
+            value = payload.get(param_name, _MISSING)
+            if value is _MISSING:
                 print(f"❌ Missing parameter '{param_name}'")
                 return False
-            if not isinstance(payload[param_name], param_type):
-                print(f"❌ Parameter '{param_name}' should be {param_type.__name__}, got {type(payload[param_name]).__name__}")
+            if not isinstance(value, param_type):
+                print(f"❌ Parameter '{param_name}' should be {param_type.__name__}, got {type(value).__name__}")
                 return False
 
-        # Check for unexpected params
-        for key in payload:
-            if key not in [p[0] for p in action["params"]]:
-                print(f"⚠️ Unexpected parameter '{key}'")
-                return False
+        # Check for unexpected params (set difference, no per-key list scan)
+        unexpected = payload.keys() - action["param_names"]
+        if unexpected:
+            print(f"⚠️ Unexpected parameter(s): {', '.join(sorted(unexpected))}")
+            return False
 
         return True
 
@@ -92,45 +188,64 @@ class HCPExecutor:
             return False
 
         device = self.devices[device_id]
+        action = device["actions"][action_name]
 
-        message = {
-            "action": action_name,
-            "payload": payload
-        }
-
-        try:
-            device["client"].conn.sendall(json.dumps(message).encode("utf-8"))
-            print(f"✅ Sent to {device_id}:{device['port']}")
-            return True
-        except Exception as e:
-            print(f"⚠️ TCP send failed for {device_id}:{device['port']} — {e}")
+        client = device["client"]
+        if client is None or client.conn is None:
+            print(f"⚠️ No connection for {device_id}:{device['port']}")
             return False
+
+        if orjson is not None:
+            payload_bytes = orjson.dumps(payload)
+        else:
+            payload_bytes = json.dumps(payload).encode("utf-8")
+
+        # fire-and-forget: enqueue the frame and wake the writer thread;
+        # the writer's scatter-gather drain reassembles header/prefix/
+        # payload/close on the wire, so the caller never blocks on a slow
+        # device. Frames carry a 4-byte big-endian length prefix.
+        total = len(action["frame_prefix"]) + len(payload_bytes) + 1
+        client.out.append(total.to_bytes(4, "big"))
+        client.out.append(action["frame_prefix"])
+        client.out.append(payload_bytes)
+        client.out.append(b"}")
+        with self._pending_lock:
+            self._pending.append(client)
+        self._wake_w.send(b"\x01")
+        print(f"✅ Queued for {device_id}:{device['port']}")
+        return True
         
     # ---------- LLM Integration ----------
     def get_device_llm_context_str(self, device_id: str) -> str:
         """Return device info in an LLM-friendly string format."""
         if device_id not in self.devices:
             raise ValueError(f"Device '{device_id}' not found.")
-        
+
         device = self.devices[device_id]
+        cached = device.get("llm_ctx")
+        if cached is not None:
+            return cached
         lines = [f"Device '{device_id}': {device['description']}", "Available actions:"]
-        
+
         for action_name, action_info in device["actions"].items():
             param_str = ", ".join([f"{name}: {ptype.__name__}" for name, ptype in action_info["params"]])
             lines.append(f" - {action_name}({param_str}) → {action_info['description']}")
-        
-        return "\n".join(lines)
-    
+
+        device["llm_ctx"] = "\n".join(lines)
+        return device["llm_ctx"]
+
     def get_all_devices_llm_context_str(self) -> str:
         """Return all registered devices and actions in an LLM-friendly string format."""
         if not self.devices:
             return "No devices are currently registered."
-        
-        lines = []
-        for device_id in self.devices.keys():
-            lines.append(self.get_device_llm_context_str(device_id))
-            lines.append("")  # blank line between devices
-        return "\n".join(lines)
+
+        if self._llm_ctx_cache is None:
+            lines = []
+            for device_id in self.devices.keys():
+                lines.append(self.get_device_llm_context_str(device_id))
+                lines.append("")  # blank line between devices
+            self._llm_ctx_cache = "\n".join(lines)
+        return self._llm_ctx_cache
 
     # ---------- Query helpers ----------
     def list_devices(self) -> Dict[str, Dict[str, Any]]:
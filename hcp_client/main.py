@@ -1,22 +1,51 @@
+import collections
+import queue
+import selectors
 import socket
 import threading
-import queue
 import time
 from enum import Enum, auto
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Callable
 import hcp_executor
 from hcp_executor import Client
 import json
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json works, just slower
+    orjson = None
 from asi1client import ASI1Client, ASI1ClientError
 import re
 import argparse
 import requests
+from requests.adapters import HTTPAdapter
 import uuid
 
 UI_URL = "http://127.0.0.1:5000"  # UI base address (change if needed)
 USE_UI = False  # will be set by argparse
 
+# UI logging is fire-and-forget: call sites enqueue (path, body) and a
+# daemon thread posts over one keep-alive connection, so a slow or absent
+# dashboard never stalls the event loop (each inline post used to block
+# up to 500 ms and open a fresh TCP connection)
+UI_SESSION = requests.Session()
+UI_SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+ui_q: queue.SimpleQueue = queue.SimpleQueue()
+
+def _ui_pump():
+    while True:
+        path, body = ui_q.get()
+        try:
+            UI_SESSION.post(f"{UI_URL}/api/{path}", json=body, timeout=2)
+        except Exception as e:
+            print(f"[UI] {path} failed: {e}")
+
+def ui_post(path: str, body: dict) -> None:
+    """Queue a UI update; no-op unless --ui was given."""
+    if USE_UI:
+        ui_q.put((path, body))
+
 # =========================
 # Voice support (optional)
 # =========================
@@ -74,6 +103,9 @@ PORT = 9000
 
 MAX_MALFORMED_MESSAGE_RETRY = 3
 
+# compiled once; this runs on every LLM reply
+_DASH_RE = re.compile(r"-----\s*(.*?)\s*-----", re.DOTALL)
+
 def extract_dashed_section(text):
     """
     Looks for a section delimited by five dashes (-----) at the start and end.
@@ -82,9 +114,7 @@ def extract_dashed_section(text):
         outside: everything else
         found: boolean indicating if section existed
     """
-    # Regex to match content between two sets of 5+ dashes
-    pattern = r"-----\s*(.*?)\s*-----"
-    match = re.search(pattern, text, re.DOTALL)
+    match = _DASH_RE.search(text)
 
     if match:
         inside = match.group(1).strip()
@@ -94,38 +124,23 @@ def extract_dashed_section(text):
     else:
         return None, text.strip(), False
     
+_JSON_DECODER = json.JSONDecoder()
+
 def extract_main_json_with_context(text):
     """
     Extract the first JSON object (dict) from a string.
     Returns a tuple: (parsed_json or None, text_outside_json, json_exists_bool)
     """
-    brace_count = 0
-    current_json = ""
-    in_json = False
-    outside_text = ""
-    json_found = False
-
-    for char in text:
-        if char == '{':
-            if not in_json:
-                in_json = True
-                current_json = ""
-            brace_count += 1
-        if in_json:
-            current_json += char
-        else:
-            outside_text += char
-        if char == '}':
-            if in_json:
-                brace_count -= 1
-                if brace_count == 0:
-                    # Attempt to parse JSON
-                    try:
-                        parsed_json = json.loads(current_json)
-                        json_found = True
-                        return parsed_json, outside_text, True
-                    except json.JSONDecodeError:
-                        return None, text, False  # Invalid JSON
+    # let the C scanner do the brace matching: try raw_decode at each '{'
+    # instead of walking the reply character by character in Python
+    i = text.find('{')
+    while i != -1:
+        try:
+            parsed_json, end = _JSON_DECODER.raw_decode(text, i)
+        except ValueError:
+            i = text.find('{', i + 1)
+            continue
+        return parsed_json, text[:i] + text[end:], True
 
     # No JSON found
     return None, text, False
@@ -135,41 +150,51 @@ def bytes_to_json(byte_string):
     Convert a byte string to a Python dictionary (parsed JSON).
     Handles both UTF-8 decoding and JSON parsing errors.
     """
+    # json.loads (and orjson) take bytes directly and skip surrounding
+    # whitespace themselves; no intermediate decoded/stripped strings
     try:
-        # Step 1: Decode bytes to string
-        decoded_str = byte_string.decode('utf-8')
-        
-        # Step 2: Clean up if there are stray characters (optional)
-        decoded_str = decoded_str.strip()
-
-        # Step 3: Parse JSON
-        data = json.loads(decoded_str)
-        return data
-
+        if orjson is not None:
+            return orjson.loads(byte_string)
+        return json.loads(byte_string)
     except UnicodeDecodeError:
         print("Error: Could not decode bytes to UTF-8 string.")
-    except json.JSONDecodeError as e:
+    except ValueError as e:
         print(f"Error: Invalid JSON data — {e}")
 
-def convert_command(device_id, command_name, command_data):
-    # Map string types to Python equivalents
-    type_map = {
-        "int": int,
-        "float": float,
-        "bool": bool,
-        "str": str
-    }
+def frame_message(payload: bytes) -> bytes:
+    """Prefix a payload with its 4-byte big-endian length."""
+    return len(payload).to_bytes(4, "big") + payload
 
-    # Extract the description
-    description = command_data.get("freetext_desc", "")
+def read_frame(buf: bytearray) -> bytes | None:
+    """Pop one complete length-prefixed frame off the front of buf.
 
+    Returns None when the buffer doesn't yet hold a full frame; the
+    partial bytes stay in place for the next read.
+    """
+    if len(buf) < 4:
+        return None
+    n = int.from_bytes(buf[:4], "big")
+    if len(buf) < 4 + n:
+        return None
+    payload = bytes(buf[4:4 + n])
+    del buf[:4 + n]
+    return payload
+
+# built once, already framed: every connect sends the identical handshake
+REQUEST_HCP_DATA_MSG = frame_message(b'{"action": "REQUEST_HCP_DATA", "payload": {}}')
+
+# Map string types to Python equivalents, built once at import
+_TYPE_MAP = {
+    "int": int,
+    "float": float,
+    "bool": bool,
+    "str": str
+}
+
+@lru_cache(maxsize=None)
+def _convert_command_cached(device_id, command_name, description, param_items):
     # Build the parameter list as tuples (name, python_type)
-    params = []
-    for p in command_data.get("params", []):
-        for k, v in p.items():
-            params.append((k, type_map.get(v, str)))
-
-    # Return your target structure
+    params = [(k, _TYPE_MAP.get(v, str)) for k, v in param_items]
     return (
         device_id,              # fixed platform name
         command_name,                    # command name
@@ -177,6 +202,16 @@ def convert_command(device_id, command_name, command_data):
         params                    # typed parameter list
     )
 
+def convert_command(device_id, command_name, command_data):
+    # flatten the params into a hashable key so reconnect storms reuse the
+    # converted tuple instead of rebuilding it per registration
+    param_items = tuple(
+        (k, v) for p in command_data.get("params", []) for k, v in p.items()
+    )
+    return _convert_command_cached(
+        device_id, command_name, command_data.get("freetext_desc", ""), param_items
+    )
+
 # =========================
 # Internal plumbing
 # =========================
@@ -193,33 +228,123 @@ class State(Enum):
     CONNECTING = auto()
     RUNNING = auto()
 
-def handle_client(conn: socket.socket, addr: tuple, event_q: queue.Queue):
-    event_q.put(ClientEvent('connect', addr))
-    try:
-        with conn:
-            while True:
-                data = conn.recv(4096)
-                if not data:
-                    event_q.put(ClientEvent('disconnect', addr))
-                    break
-                event_q.put(ClientEvent('data', addr, payload=data))
-    except Exception as e:
-        event_q.put(ClientEvent('error', addr, error=e))
-    finally:
-        try:
-            conn.shutdown(socket.SHUT_RDWR)
-        except Exception:
-            pass
-
 def start_server():
     ready_for_user_input = False
     retryCount = 0
-    event_q: queue.Queue[ClientEvent] = queue.Queue()
+    # events ride the selector wakeup itself: the reactor drains readable
+    # sockets into this deque and the state machine consumes it in the same
+    # iteration, so there is no separate 100 ms queue poll adding latency.
+    # maxlen bounds the queue so a runaway producer drops oldest events
+    # instead of growing without limit
+    events: collections.deque[ClientEvent] = collections.deque(maxlen=10000)
+    # owned exclusively by the event-loop thread since accept moved into
+    # the selector; no lock needed
     clients: dict[tuple, Client] = {}
-    clients_lock = threading.Lock()
+    # user input arrives via a pump thread so the reactor never blocks on
+    # a human: running_tick polls input_q and returns immediately when
+    # nothing has been typed. input_needed gates the pump so the "You:"
+    # prompt only appears when the state machine wants a line.
+    input_q: queue.SimpleQueue = queue.SimpleQueue()
+    input_needed = threading.Event()
+    # one prompt per requested line: set alongside input_needed, cleared
+    # when the line is consumed, so ticks that land while the user is
+    # typing don't re-arm the event and trigger a second "You: " prompt
+    prompt_pending = False
+
+    def input_pump():
+        while True:
+            input_needed.wait()
+            input_needed.clear()
+            try:
+                if USE_VOICE:
+                    text = listen_to_speech()
+                else:
+                    text = input("You: ").strip()
+            except (KeyboardInterrupt, EOFError):
+                input_q.put(None)  # sentinel: shut down
+                return
+            input_q.put(text)
+    # one reactor instead of a thread (and 8 KiB stack) per client; every
+    # socket is non-blocking and multiplexed through a single selector
+    sel = selectors.DefaultSelector()
+
+    # partial inbound bytes per client, waiting for a complete frame
+    in_bufs: dict[tuple, bytearray] = {}
+    # pending outbound bytes per client, flushed on EVENT_WRITE readiness;
+    # send_to/broadcast only append, so a slow client never blocks the loop
+    # (or, for broadcast, the other clients)
+    out_bufs: dict[tuple, bytearray] = {}
+
+    def drop_client(conn: socket.socket, addr: tuple = None):
+        in_bufs.pop(addr, None)
+        out_bufs.pop(addr, None)
+        try:
+            sel.unregister(conn)
+        except (KeyError, ValueError):
+            pass
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def queue_send(c: Client, data: bytes) -> None:
+        buf = out_bufs.setdefault(c.addr, bytearray())
+        buf += data
+        try:
+            sel.modify(c.conn, selectors.EVENT_READ | selectors.EVENT_WRITE, data=c.addr)
+        except (KeyError, ValueError):
+            pass
+
+    def flush(conn: socket.socket, addr: tuple) -> None:
+        buf = out_bufs.get(addr)
+        if buf:
+            try:
+                n = conn.send(buf)
+                del buf[:n]
+            except BlockingIOError:
+                return
+            except Exception as e:
+                print(f"[!] send to {addr} failed: {e}")
+                buf.clear()
+        if not buf:
+            out_bufs.pop(addr, None)
+            try:
+                sel.modify(conn, selectors.EVENT_READ, data=addr)
+            except (KeyError, ValueError):
+                pass
+
+    # one preallocated receive buffer for the whole loop (drain only runs
+    # on this thread): recv_into fills it in place instead of allocating a
+    # fresh 4 KiB bytes object per syscall
+    recv_buf = bytearray(64 * 1024)
+    recv_view = memoryview(recv_buf)
+
+    def drain(conn: socket.socket, addr: tuple):
+        """Edge-style drain: read until EAGAIN so one wakeup consumes
+        everything the kernel has buffered for this socket."""
+        while True:
+            try:
+                n = conn.recv_into(recv_buf)
+            except BlockingIOError:
+                return
+            except Exception as e:
+                events.append(ClientEvent('error', addr, error=e))
+                drop_client(conn, addr)
+                return
+            if n == 0:
+                events.append(ClientEvent('disconnect', addr))
+                drop_client(conn, addr)
+                return
+            # accumulate and emit one event per complete length-prefixed
+            # frame; a segmented or pipelined message no longer reaches the
+            # JSON parser as a partial document
+            buf = in_bufs.setdefault(addr, bytearray())
+            buf += recv_view[:n]
+            while (frm := read_frame(buf)) is not None:
+                events.append(ClientEvent('data', addr, payload=frm))
 
     def running_tick() -> None:
-        nonlocal ready_for_user_input, retryCount
+        nonlocal ready_for_user_input, retryCount, prompt_pending
         """
         Called repeatedly during RUNNING (very frequently).
         Use send_to/broadcast/list_clients from here to drive real-time behavior.
@@ -227,11 +352,17 @@ def start_server():
         """
         if ready_for_user_input:
             try:
-                if USE_VOICE:
-                    user_input = listen_to_speech()
-                else:
-                    user_input = input("You: ").strip()
-            except (KeyboardInterrupt, EOFError):
+                user_input = input_q.get_nowait()
+            except queue.Empty:
+                # ask the pump for a line — at most once per outstanding
+                # prompt — and keep servicing sockets while the user types
+                if not prompt_pending:
+                    prompt_pending = True
+                    input_needed.set()
+                return
+            prompt_pending = False
+
+            if user_input is None:
                 print("\nExiting...")
                 exit(0)
 
@@ -241,86 +372,107 @@ def start_server():
 
             if not user_input:
                 return
-            
+
             messages.append({"role": "user", "content": user_input})
             ready_for_user_input = False
         else:
             # Add user message to history
             try:
-                response = client.chat_completion(messages)
-                ai_reply = response["choices"][0]["message"]["content"].strip()
+                # stream the completion over the client's keep-alive session:
+                # no per-turn TCP/TLS setup, and once a complete -----
+                # command block has arrived we stop reading instead of
+                # waiting for the model to finish composing
+                reply_parts = []
+                for delta in client.chat_completion_stream(messages):
+                    reply_parts.append(delta)
+                    if "-" in delta and _DASH_RE.search("".join(reply_parts)):
+                        break
+                ai_reply = "".join(reply_parts).strip()
                 messages.append({"role": "assistant", "content": ai_reply})
                 action, outside, isCommand = extract_main_json_with_context(ai_reply)
                 print(f"AI: {outside}\n")
                 if not isCommand:
                     ready_for_user_input = True
                     return
-                with clients_lock:
-                    if USE_UI:
-                        req_id = str(uuid.uuid4())
-                        try:
-                            requests.post(f"{UI_URL}/api/log_request", json={
-                                "request_id": req_id,
-                                "target_hardware": action["target_hardware"],
-                                "toolname": action["toolname"],
-                                "command_body": action["command_body"]
-                            }, timeout=0.5)
-                        except Exception as e:
-                            print(f"[UI] Failed to log request: {e}")
-        
-                    if (False == hcp.execute_action(action["target_hardware"], action["toolname"], action["command_body"])):
-                        if retryCount < MAX_MALFORMED_MESSAGE_RETRY:
-                            retryCount += 1
-                            print(f"AI: Malformed command JSON. Retrying ({retryCount}/{MAX_MALFORMED_MESSAGE_RETRY})...\n")
-                            messages.append({"role": "user", "content": "ERROR: Malformed message. Check your message structure against the system prompt and try again without prompting the user."})
-                        else:
-                            messages.append({"role": "user", "content": "ERROR: Message is continously malformed. Stop retrying and instructor the user that you were unable to send a command and that they should retry."})
+                ui_post("log_request", {
+                    "request_id": str(uuid.uuid4()),
+                    "target_hardware": action["target_hardware"],
+                    "toolname": action["toolname"],
+                    "command_body": action["command_body"]
+                })
+
+                if (False == hcp.execute_action(action["target_hardware"], action["toolname"], action["command_body"])):
+                    if retryCount < MAX_MALFORMED_MESSAGE_RETRY:
+                        retryCount += 1
+                        print(f"AI: Malformed command JSON. Retrying ({retryCount}/{MAX_MALFORMED_MESSAGE_RETRY})...\n")
+                        messages.append({"role": "user", "content": "ERROR: Malformed message. Check your message structure against the system prompt and try again without prompting the user."})
                     else:
-                        retryCount = 0
+                        messages.append({"role": "user", "content": "ERROR: Message is continously malformed. Stop retrying and instructor the user that you were unable to send a command and that they should retry."})
+                else:
+                    retryCount = 0
             except ASI1ClientError as e:
                 print(f"[Error] {e}")
             except Exception as e:
                 print(f"[Unexpected error] {e}")
     
 
-    def accept_loop(server_sock: socket.socket):
+    def accept_pending(server_sock: socket.socket):
+        # the listening socket is non-blocking too; take every queued
+        # connection in one wakeup
         while True:
-            conn, addr = server_sock.accept()
-            t = threading.Thread(target=handle_client, args=(conn, addr, event_q), daemon=True)
-            with clients_lock:
-                clients[addr] = Client(conn=conn, addr=addr, thread=t, alive=True)
-            t.start()
-
-    # helpers safe to use from hooks
+            try:
+                conn, addr = server_sock.accept()
+            except BlockingIOError:
+                return
+            conn.setblocking(False)
+            # small control frames shouldn't wait out Nagle, and the
+            # default buffers are tight for bursty device payloads
+            try:
+                conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                conn.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 20)
+                conn.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+                if hasattr(socket, "TCP_QUICKACK"):  # Linux only
+                    conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+                # detect silently-dead devices without app-level pings
+                conn.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+                if hasattr(socket, "TCP_KEEPIDLE"):  # Linux only
+                    conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30)
+            except OSError:
+                pass
+            clients[addr] = Client(conn=conn, addr=addr, thread=None, alive=True)
+            events.append(ClientEvent('connect', addr))
+            sel.register(conn, selectors.EVENT_READ, data=addr)
+
+    # helpers; like clients itself these belong to the event-loop thread
     def send_to(addr: tuple, data: bytes) -> None:
-        with clients_lock:
-            c = clients.get(addr)
-            if c and c.alive:
-                try:
-                    c.conn.sendall(data)
-                except Exception as e:
-                    print(f"[!] send_to {addr} failed: {e}")
+        c = clients.get(addr)
+        if c and c.alive:
+            queue_send(c, data)
 
     def broadcast(data: bytes) -> None:
-        with clients_lock:
-            for a, c in list(clients.items()):
-                if c.alive:
-                    try:
-                        c.conn.sendall(data)
-                    except Exception as e:
-                        print(f"[!] broadcast to {a} failed: {e}")
+        # appends only; the selector flushes each buffer as its socket
+        # becomes writable, so one stalled client can't serialize the rest
+        for c in clients.values():
+            if c.alive:
+                queue_send(c, data)
 
     def list_clients() -> list[tuple]:
-        with clients_lock:
-            return [a for a, c in clients.items() if c.alive]
+        return [a for a, c in clients.items() if c.alive]
 
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server:
         server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         server.bind((HOST, PORT))
         server.listen()
         print(f"Server listening on {HOST}:{PORT}")
+        # accept through the same selector as everything else: no accept
+        # thread, no cross-thread wakeups, and all sockets stay in the
+        # timeout=0 fast path for non-blocking calls
+        server.setblocking(False)
+        sel.register(server, selectors.EVENT_READ, data=None)
 
-        threading.Thread(target=accept_loop, args=(server,), daemon=True).start()
+        threading.Thread(target=input_pump, daemon=True).start()
+        if USE_UI:
+            threading.Thread(target=_ui_pump, daemon=True).start()
 
         # ============
         # State machine
@@ -347,27 +499,37 @@ def start_server():
                     )
                     ready_for_user_input = True
 
-                # --- event processing (common) ---
-                # Use a short timeout so RUNNING gets frequent ticks.
-                timeout = 0.1
-                try:
-                    evt = event_q.get(timeout=timeout)
-                except queue.Empty:
-                    evt = None
-
-                if evt:
+                # --- I/O + event processing (common) ---
+                # Block directly on the selector: in CONNECTING sleep until
+                # the deadline, in RUNNING use a short tick so running_tick
+                # stays frequent. Every readable socket is drained into the
+                # events deque and all pending events are handled at once.
+                if state == State.CONNECTING:
+                    timeout = max(0.0, connecting_deadline - now)
+                else:
+                    timeout = 0.005
+                for key, mask in sel.select(timeout=timeout):
+                    if key.data is None:
+                        accept_pending(server)
+                        continue
+                    if mask & selectors.EVENT_READ:
+                        drain(key.fileobj, key.data)
+                    if mask & selectors.EVENT_WRITE:
+                        flush(key.fileobj, key.data)
+
+                # Bounded batch drain: handle a burst of events in one pass
+                # (no per-event queue locking, one running_tick afterwards),
+                # but cap the batch so a flood can never starve the tick —
+                # leftovers are picked up next iteration.
+                for _ in range(64):
+                    if not events:
+                        break
+                    evt = events.popleft()
                     if evt.kind == 'connect':
                         print(f"[+] {evt.addr} connected")
                         if state == State.CONNECTING:
                             # Send GET_API request on startup
-                            msg_json = """
-                            {
-                                "action": "REQUEST_HCP_DATA",
-                                "payload": {}
-                            }
-                            """
-                            msg = msg_json.encode()
-                            send_to(evt.addr, msg)
+                            send_to(evt.addr, REQUEST_HCP_DATA_MSG)
 
                     elif evt.kind == 'data':
                         # Always deliver data to your handler
@@ -377,47 +539,38 @@ def start_server():
                             available_commands = json_payload["available_commands"]
                             hcp.register_device(metadata["device_id"], metadata["freetext_desc"], evt.addr, clients.get(evt.addr))
                             
-                            if USE_UI:
-                                try:
-                                    requests.post(f"{UI_URL}/api/register_device", json={
-                                        "device_id": metadata["device_id"],
-                                        "freetext_desc": metadata.get("freetext_desc", ""),
-                                        "addr": list(evt.addr),
-                                        "available_commands": available_commands
-                                    }, timeout=0.5)
-                                except Exception as e:
-                                    print(f"[UI] Device registration failed: {e}")
-                            
+                            ui_post("register_device", {
+                                "device_id": metadata["device_id"],
+                                "freetext_desc": metadata.get("freetext_desc", ""),
+                                "addr": list(evt.addr),
+                                "available_commands": available_commands
+                            })
+
+
                             for command_name, command_data in available_commands.items():
                                 hcp.register_action(*convert_command(metadata["device_id"], command_name, command_data))
                         elif state == State.RUNNING:
                             messages.append({"role": "user", "content": "Response from device: " + str(evt.payload)})
-                            if USE_UI:
-                                try:
-                                    requests.post(f"{UI_URL}/api/log_response", json={
-                                        "request_id": str(uuid.uuid4()),
-                                        "target_hardware": str(evt.addr),
-                                        "status": "ok",
-                                        "payload": evt.payload.decode("utf-8", errors="ignore")
-                                    }, timeout=0.5)
-                                except Exception as e:
-                                    print(f"[UI] Failed to log device response: {e}")
+                            ui_post("log_response", {
+                                "request_id": str(uuid.uuid4()),
+                                "target_hardware": str(evt.addr),
+                                "status": "ok",
+                                "payload": evt.payload.decode("utf-8", errors="ignore")
+                            })
 
                     elif evt.kind == 'disconnect':
                         print(f"[-] {evt.addr} disconnected")
-                        with clients_lock:
-                            c = clients.pop(evt.addr, None)
-                            if c:
-                                try: c.conn.close()
-                                except Exception: pass
+                        c = clients.pop(evt.addr, None)
+                        if c:
+                            try: c.conn.close()
+                            except Exception: pass
 
                     elif evt.kind == 'error':
                         print(f"[!] {evt.addr} error: {evt.error}")
-                        with clients_lock:
-                            c = clients.pop(evt.addr, None)
-                            if c:
-                                try: c.conn.close()
-                                except Exception: pass
+                        c = clients.pop(evt.addr, None)
+                        if c:
+                            try: c.conn.close()
+                            except Exception: pass
 
                 # --- per-state behavior ---
                 if state == State.RUNNING:
@@ -427,12 +580,11 @@ def start_server():
         except KeyboardInterrupt:
             print("\nShutting down...")
         finally:
-            with clients_lock:
-                for c in clients.values():
-                    try: c.conn.shutdown(socket.SHUT_RDWR)
-                    except Exception: pass
-                    try: c.conn.close()
-                    except Exception: pass
+            for c in clients.values():
+                try: c.conn.shutdown(socket.SHUT_RDWR)
+                except Exception: pass
+                try: c.conn.close()
+                except Exception: pass
             # server socket closed by context manager
 
 if __name__ == "__main__":
@@ -9,11 +9,16 @@ client.start()
 
 tag_detections.camera_setup()
 
+CAMERA_PERIOD_S = 0.1
+next_tick = time.monotonic() + CAMERA_PERIOD_S
+
 while True:
     tag_detections.camera_run()
     try:
-        # Non-blocking check for new HCP commands
-        action, payload = client.events.get_nowait()        
+        # Block for new HCP commands until the next camera tick is due,
+        # so the loop sleeps in the queue instead of busy-polling
+        timeout = max(0.0, next_tick - time.monotonic())
+        action, payload = client.events.get(timeout=timeout)
         print(f"[EVENT] {action}: {payload}")
 
         if (action == "get_tags"):
@@ -29,5 +34,12 @@ while True:
     except queue.Empty:
         pass
 
-    # other main loop tasks
-    time.sleep(0.1)
\ No newline at end of file
+    # pace frames against a monotonic deadline so the camera rate doesn't
+    # drift with per-iteration processing time
+    remaining = next_tick - time.monotonic()
+    if remaining > 0:
+        time.sleep(remaining)
+        next_tick += CAMERA_PERIOD_S
+    else:
+        # fell behind (e.g. slow detection pass); resync rather than rush
+        next_tick = time.monotonic() + CAMERA_PERIOD_S
\ No newline at end of file